@@ -1,11 +1,10 @@
-import asyncio
 from enum import Enum
 from datetime import datetime
 import json
 import os
 from textwrap import dedent
 from typing import Any, Dict, Optional, Callable, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from autogen import Agent as AutogenAgent, ModelClient
 from termcolor import cprint
 from typing import Optional
@@ -17,6 +16,7 @@ from autotx.helper_agents import clarifier, manager, user_proxy
 from autotx.intents import Intent
 from autotx.utils.color import Color
 from autotx.utils.logging.Logger import Logger
+from autotx.utils.ethereum.lifi import Lifi
 from autotx.utils.ethereum.networks import NetworkInfo
 from autotx.utils.constants import OPENAI_BASE_URL, OPENAI_MODEL_NAME
 from autotx.smart_accounts.smart_account import SmartAccount
@@ -63,6 +63,16 @@ class EndReason(Enum):
     TERMINATE = "TERMINATE"
     GOAL_NOT_SUPPORTED = "GOAL_NOT_SUPPORTED"
 
+@dataclass
+class ToolCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
 @dataclass
 class RunResult:
     summary: str
@@ -72,6 +82,8 @@ class RunResult:
     total_cost_without_cache: float
     total_cost_with_cache: float
     info_messages: list[str]
+    # Cache lookups made by the tools during the run, by tool name
+    tool_cache_stats: dict[str, ToolCacheStats] = field(default_factory=dict)
 
 class AutoTx:
     web3: Web3
@@ -87,6 +99,7 @@ class AutoTx:
     current_run_cost_without_cache: float
     current_run_cost_with_cache: float
     info_messages: list[str]
+    tool_cache_stats: dict[str, ToolCacheStats]
     verbose: bool
     on_notify_user: Callable[[str], None] | None
     on_agent_message: Optional[Callable[[AssistantAgent, Union[Dict[str, Any], str], AutogenAgent, bool], Union[Dict[str, Any], str]]]
@@ -119,17 +132,19 @@ class AutoTx:
         self.current_run_cost_without_cache = 0
         self.current_run_cost_with_cache = 0
         self.info_messages = []
+        self.tool_cache_stats = {}
         self.on_notify_user = on_notify_user
         self.custom_model = config.custom_model
         self.on_agent_message = build_on_message_hook(config.on_agent_message) if config.on_agent_message else None
 
     def run(self, prompt: str, non_interactive: bool, summary_method: str = "last_msg") -> RunResult:
-        return asyncio.run(self.a_run(prompt, non_interactive, summary_method))    
+        return Lifi.run(self.a_run(prompt, non_interactive, summary_method))
 
     async def a_run(self, prompt: str, non_interactive: bool, summary_method: str = "last_msg") -> RunResult:
         total_cost_without_cache: float = 0
         total_cost_with_cache: float = 0
         info_messages = []
+        self.tool_cache_stats = {}
 
         if self.verbose:
             available_config = self.get_llm_config()
@@ -165,7 +180,8 @@ class AutoTx:
                     result.end_reason, 
                     total_cost_without_cache, 
                     total_cost_with_cache, 
-                    info_messages
+                    info_messages,
+                    self.tool_cache_stats,
                 )
             else:
                 prompt_not_supported = "Prompt not supported. Please provide a new prompt."
@@ -284,6 +300,13 @@ class AutoTx:
         self.intents.extend(intents)
         self.wallet.on_intents_prepared(intents)
 
+    def record_tool_cache_lookup(self, tool_name: str, hit: bool) -> None:
+        stats = self.tool_cache_stats.setdefault(tool_name, ToolCacheStats())
+        if hit:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+
     def notify_user(self, message: str, color: Color | None = None) -> None:
         if color:
             cprint(message, color)
@@ -1,15 +1,19 @@
 
+import asyncio
 import json
 from textwrap import dedent
-from typing import Annotated, Callable, Optional, Union, cast
+from typing import Annotated, Any, Callable, Coroutine, Hashable, MutableMapping, Optional, TypeVar, Union, cast
 from web3 import Web3
 from autotx.AutoTx import AutoTx
 from gnosis.eth import EthereumNetworkNotSupported as ChainIdNotSupported
-from coingecko import GeckoAPIException, CoinGeckoDemoClient
+from coingecko import GeckoAPIException
 
 from autotx.autotx_agent import AutoTxAgent
 from autotx.autotx_tool import AutoTxTool
-from autotx.utils.constants import COINGECKO_API_KEY
+from autotx.utils.coingecko import get_coingecko
+from autotx.utils.coingecko.coin_list import coin_list
+from autotx.utils.coingecko.response_cache import coingecko_responses
+from autotx.utils.coingecko.symbol_index import get_symbol_search_index
 from autotx.utils.ethereum.networks import SUPPORTED_NETWORKS_AS_STRING, ChainId
 
 name = "research-tokens"
@@ -20,6 +24,7 @@ system_message = lambda autotx: dedent(f"""
     You use the tools available to assist the user in their tasks.
     NEVER ask the user questions.
     Retrieve token information, get token price, market cap, and price change percentage.
+    To compare or get the price of more than one token, call get_tokens_information once with all of their ids instead of calling get_token_information for each token.
     BEFORE calling get_tokens_based_on_category always call get_available_categories to get the list of available categories.
     You MUST keep in mind the network the user is on and if the request is for a specific network, all networks, or the current network (it could be implied).
     If the user is interested in buying the tokens you're researching make sure you're searching them for his network.
@@ -50,43 +55,62 @@ COINGECKO_NETWORKS_TO_SUPPORTED_NETWORKS_MAP = {
     ChainId.GNOSIS: "xdai",
 }
 
-def get_coingecko() -> CoinGeckoDemoClient:
-    return CoinGeckoDemoClient(api_key=COINGECKO_API_KEY)
-
-
-def get_tokens_and_filter_per_network(
-    network_name: str,
-) -> list[dict[str, Union[str, dict[str, str]]]]:
+T = TypeVar("T")
+
+async def get_cached_response(autotx: AutoTx, tool_name: str, endpoint: str, key: Hashable, fetch: Callable[[], T]) -> T:
+    # Responses are shared by the runs of the process, the lookups are recorded in the run's tool cache stats.
+    # fetch runs in a thread: CoinGecko requests wait for the shared rate limiter and for 429s to clear,
+    # which must not hold up the event loop the other tasks of the server run on
+    (response, hit) = await coingecko_responses.a_get(endpoint, key, fetch)
+    autotx.record_tool_cache_lookup(tool_name, hit)
+    return response
+
+def search_token_locally(autotx: AutoTx, token_symbol: str) -> list[str]:
+    # Searches the local coin list, the coin of the network's own token with that symbol (if any) coming first
+    try:
+        index = get_symbol_search_index()
+        coins = coin_list.get()
+    except Exception as e:
+        print(f"Local token search unavailable: {e}")
+        return []
+
+    preferred_ids: list[str] = []
+    platform = COINGECKO_NETWORKS_TO_SUPPORTED_NETWORKS_MAP.get(autotx.network.chain_id)
+    address = autotx.network.tokens.get(token_symbol.strip().lower())
+    if platform and address:
+        coin = coins.get_coin_by_address(platform, address)
+        if coin:
+            preferred_ids.append(coin["id"])
+
+    return index.search(token_symbol, preferred_ids)
+
+def get_coingecko_network_key(network_name: str) -> str:
     network = ChainId[network_name] # type: ignore
     coingecko_network_key = COINGECKO_NETWORKS_TO_SUPPORTED_NETWORKS_MAP.get(network)
-    if coingecko_network_key == None:
+    if coingecko_network_key is None:
         raise ChainIdNotSupported(f"Network {network_name} not supported")
+    return coingecko_network_key
 
-    token_list_with_addresses = get_coingecko().coins.get_list(include_platform=True)
-    return [
-        token
-        for token in token_list_with_addresses
-        if coingecko_network_key in token["platforms"]
-    ]
+def get_tokens_and_filter_per_network(
+    network_name: str,
+) -> list[dict[str, Union[str, dict[str, str]]]]:
+    return coin_list.get().get_coins_on_platform(get_coingecko_network_key(network_name))
 
 def filter_token_list_by_network(tokens: list[dict[str, str]], network_name: str) -> list[dict[str, Union[str, dict[str, str]]]]:
-    tokens_in_category_map = {category["id"]: category for category in tokens}
-    filtered_tokens_map = {
-        token["id"]: token for token in get_tokens_and_filter_per_network(network_name)
-    }
-
-    return [
-        {
-            **tokens_in_category_map[token["id"]],
-            **filtered_tokens_map[token["id"]],
-        }
-        for token in tokens
-        if token["id"] in filtered_tokens_map
-    ]
+    coingecko_network_key = get_coingecko_network_key(network_name)
+    coins = coin_list.get()
+
+    filtered_tokens: list[dict[str, Union[str, dict[str, str]]]] = []
+    for token in tokens:
+        coin = coins.get_coin(token["id"])
+        if coin and coingecko_network_key in coin["platforms"]:
+            filtered_tokens.append({ **token, **coin })
+
+    return filtered_tokens
 
 def add_tokens_address_if_not_in_registry(
     tokens_in_category: list[dict[str, Union[str, dict[str, str]]]],
-    tokens: dict[str, str],
+    tokens: MutableMapping[str, str],
     current_network: str,
 ) -> None:
     for token_with_address in tokens_in_category:
@@ -106,18 +130,24 @@ class GetTokenInformationTool(AutoTxTool):
         """
     )
 
-    def build_tool(self, autotx: AutoTx) -> Callable[[str], str]:
-        def run(
+    def build_tool(self, autotx: AutoTx) -> Callable[[str], Coroutine[Any, Any, str]]:
+        async def run(
             token_id: Annotated[str, "ID of token"]
         ) -> str:
             autotx.notify_user(f"Fetching token information for {token_id}")
            
-            token_information = get_coingecko().coins.get_id(
-                id=token_id,
-                localization=False,
-                tickers=False,
-                community_data=False,
-                sparkline=False,
+            token_information = await get_cached_response(
+                autotx,
+                self.name,
+                "coin",
+                token_id,
+                lambda: get_coingecko().coins.get_id(
+                    id=token_id,
+                    localization=False,
+                    tickers=False,
+                    community_data=False,
+                    sparkline=False,
+                ),
             )
 
             return json.dumps(
@@ -157,23 +187,80 @@ class GetTokenInformationTool(AutoTxTool):
 
         return run
 
+class GetTokensInformationTool(AutoTxTool):
+    name: str = "get_tokens_information"
+    description: str = dedent(
+        """
+        Retrieve information of many tokens at once (current price, market cap, total volume and price change percentages), without their descriptions
+        """
+    )
+
+    def build_tool(self, autotx: AutoTx) -> Callable[[str], Coroutine[Any, Any, str]]:
+        async def run(
+            token_ids: Annotated[str, "Comma separated IDs of tokens (e.g. bitcoin,ethereum,uniswap)"]
+        ) -> str:
+            ids = list(dict.fromkeys(token_id.strip().lower() for token_id in token_ids.split(",") if token_id.strip()))
+            autotx.notify_user(f"Fetching token information for {', '.join(ids)}")
+
+            tokens = await get_cached_response(
+                autotx,
+                self.name,
+                "markets",
+                ("ids", tuple(sorted(ids))),
+                lambda: get_coingecko().coins.get_markets(
+                    vs_currency="usd",
+                    ids=",".join(ids),
+                    price_change_percentage="24h,7d,30d,200d,1y",
+                    per_page=250,
+                ),
+            )
+            tokens_by_id = { token["id"]: token for token in tokens }
+
+            return json.dumps(
+                {
+                    token_id: {
+                        "name": token["name"],
+                        "symbol": token["symbol"],
+                        "current_price_in_usd": token["current_price"],
+                        "market_cap_in_usd": token["market_cap"],
+                        "total_volume_last_24h": token["total_volume"],
+                        "price_change_percentage_24h": token["price_change_percentage_24h_in_currency"],
+                        "price_change_percentage_7d": token["price_change_percentage_7d_in_currency"],
+                        "price_change_percentage_30d": token["price_change_percentage_30d_in_currency"],
+                        "price_change_percentage_200d": token["price_change_percentage_200d_in_currency"],
+                        "price_change_percentage_1y": token["price_change_percentage_1y_in_currency"],
+                    } if (token := tokens_by_id.get(token_id)) else f"Token {token_id} not found"
+                    for token_id in ids
+                }
+            )
+
+        return run
+
 class SearchTokenTool(AutoTxTool):
     name: str = "search_token"
     description: str = "Search token based on its symbol. It will return the ID of tokens with the largest market cap"
 
-    def build_tool(self, autotx: AutoTx) -> Callable[[str, bool], str]:
-        def run(
+    def build_tool(self, autotx: AutoTx) -> Callable[[str, bool], Coroutine[Any, Any, str]]:
+        async def run(
             token_symbol: Annotated[str, "Symbol of token to search"],
             retrieve_duplicate: Annotated[bool, "Set to true to retrieve all instances of tokens sharing the same symbol, indicating potential duplicates. By default, it is False, meaning only a single, most relevant token is retrieved unless duplication is explicitly requested."]
         ) -> str:
             autotx.notify_user(f"Searching for token with symbol: {token_symbol}")
 
-            response = get_coingecko().search.get(token_symbol)
+            # The coin list may have to be downloaded and indexed first, which is done off the event loop
+            tokens = await asyncio.to_thread(search_token_locally, autotx, token_symbol)
+            if tokens:
+                autotx.record_tool_cache_lookup(self.name, True)
+            else:
+                response = await get_cached_response(
+                    autotx, self.name, "search", token_symbol.lower(), lambda: get_coingecko().search.get(token_symbol)
+                )
+
+                if len(response["coins"]) == 0:
+                    return f"No tokens found for search with symbol: {token_symbol}"
 
-            if len(response["coins"]) == 0:
-                return f"No tokens found for search with symbol: {token_symbol}"
+                tokens = [token["api_symbol"] for token in response["coins"]]
 
-            tokens = [token["api_symbol"] for token in response["coins"]]
             return json.dumps(tokens if retrieve_duplicate else tokens[0])
 
         return run
@@ -182,11 +269,13 @@ class GetAvailableCategoriesTool(AutoTxTool):
     name: str = "get_available_categories"
     description: str = "Retrieve all available category ids of tokens"
 
-    def build_tool(self, autotx: AutoTx) -> Callable[[], str]:
-        def run() -> str:
+    def build_tool(self, autotx: AutoTx) -> Callable[[], Coroutine[Any, Any, str]]:
+        async def run() -> str:
             autotx.notify_user("Fetching available token categories")
 
-            categories = get_coingecko().categories.get_list()
+            categories = await get_cached_response(
+                autotx, self.name, "categories", "list", lambda: get_coingecko().categories.get_list()
+            )
             return json.dumps([category["category_id"] for category in categories])
         
         return run
@@ -195,8 +284,8 @@ class GetTokensBasedOnCategoryTool(AutoTxTool):
     name: str = "get_tokens_based_on_category"
     description: str = "Retrieve all tokens with their respective information (symbol, market cap, price change percentages and total traded volume in the last 24 hours) from a given category"
 
-    def build_tool(self, autotx: AutoTx) -> Callable[[str, str, int, str, Optional[str]], str]:
-        def run(
+    def build_tool(self, autotx: AutoTx) -> Callable[[str, str, int, str, Optional[str]], Coroutine[Any, Any, str]]:
+        async def run(
             category: Annotated[str, "Category to retrieve tokens"],
             sort_by: Annotated[str, "Sort tokens by field. It can be: 'volume_desc' | 'volume_asc' | 'market_cap_desc' | 'market_cap_asc'. 'market_cap_desc' is the default"],
             limit: Annotated[int, "The number of tokens to return from the category"],
@@ -206,12 +295,18 @@ class GetTokensBasedOnCategoryTool(AutoTxTool):
             autotx.notify_user(f"Fetching tokens from category: {category}")
 
             try:
-                tokens_in_category = get_coingecko().coins.get_markets(
-                    vs_currency="usd",
-                    category=category,
-                    order=sort_by,
-                    price_change_percentage="1h,24h,7d,14d,30d,200d,1y",
-                    per_page=250,
+                tokens_in_category = await get_cached_response(
+                    autotx,
+                    self.name,
+                    "markets",
+                    (category, sort_by),
+                    lambda: get_coingecko().coins.get_markets(
+                        vs_currency="usd",
+                        category=category,
+                        order=sort_by,
+                        price_change_percentage="1h,24h,7d,14d,30d,200d,1y",
+                        per_page=250,
+                    ),
                 )
             except GeckoAPIException as e:
                 if "Not Found" == e.error_message["error"]:
@@ -220,8 +315,8 @@ class GetTokensBasedOnCategoryTool(AutoTxTool):
                     )
             
             if network_name:
-                tokens_in_category = filter_token_list_by_network(
-                    tokens_in_category, network_name
+                tokens_in_category = await asyncio.to_thread(
+                    filter_token_list_by_network, tokens_in_category, network_name
                 )
 
                 current_network = COINGECKO_NETWORKS_TO_SUPPORTED_NETWORKS_MAP.get(
@@ -261,6 +356,7 @@ class ResearchTokensAgent(AutoTxAgent):
     description = description
     tools = [
         GetTokenInformationTool(),
+        GetTokensInformationTool(),
         SearchTokenTool(),
         GetAvailableCategoriesTool(),
         GetTokensBasedOnCategoryTool(),
@@ -8,11 +8,13 @@ from autotx.intents import SendIntent
 from autotx.token import Token
 from autotx.utils.ethereum import (
     build_transfer_erc20,
+    get_balances,
     get_erc20_balance,
 )
 from autotx.utils.ethereum.constants import NATIVE_TOKEN_ADDRESS
 from autotx.eth_address import ETHAddress
 from autotx.utils.ethereum.get_native_balance import get_native_balance
+from autotx.utils.ethereum.networks import SUPPORTED_NETWORKS_CONFIGURATION_MAP
 from web3.types import TxParams
 
 name = "send-tokens"
@@ -24,6 +26,7 @@ system_message = lambda autotx: dedent(f"""
     You use the tools available to assist the user in their tasks. 
     Your job is to only prepare the transactions by calling the prepare_transfer_transaction tool and the user will take care of executing them.
     NOTE: There is no reason to call get_token_balance after calling prepare_transfer_transaction as the transfers are only prepared and not executed. 
+    NOTE: To check the balances of more than one token, call get_portfolio_balances once instead of calling get_token_balance for each token.
     NOTE: A balance of a token is not required to perform a send, if there is an earlier prepared transaction that will provide the token.
     NEVER ask the user questions.
     
@@ -131,6 +134,48 @@ class GetTokenBalanceTool(AutoTxTool):
 
         return run
     
+class GetPortfolioBalancesTool(AutoTxTool):
+    name: str = "get_portfolio_balances"
+    description: str = dedent(
+        """
+        Check owner balances of many tokens at once
+        """
+    )
+
+    def build_tool(self, autotx: AutoTx) -> Callable[[str, str], str]:
+        def run(
+            owner: Annotated[str, "The token owner's address or ENS domain"],
+            tokens: Annotated[str, "Comma separated token symbols to check (e.g. ETH,USDC,WBTC). Leave empty to check the common tokens of the network"] = "",
+        ) -> str:
+            owner_addr = ETHAddress(owner)
+
+            symbols = [token.strip().lower() for token in tokens.split(",") if token.strip()]
+            if not symbols:
+                network_config = SUPPORTED_NETWORKS_CONFIGURATION_MAP[autotx.network.chain_id]
+                symbols = list(network_config.default_tokens.keys())
+
+            unknown_symbols = [symbol for symbol in symbols if symbol not in autotx.network.tokens]
+            known_symbols = [symbol for symbol in symbols if symbol in autotx.network.tokens]
+
+            balances = get_balances(
+                autotx.web3,
+                owner_addr,
+                [ETHAddress(autotx.network.tokens[symbol]) for symbol in known_symbols],
+            )
+
+            lines = [
+                f"{symbol.upper()}: {balances[autotx.network.tokens[symbol].lower()]}"
+                for symbol in known_symbols
+            ]
+            lines.extend(f"{symbol.upper()}: unknown token" for symbol in unknown_symbols)
+
+            summary = "\n".join(lines)
+            autotx.notify_user(f"Fetching balances for {str(owner_addr)}:\n{summary}")
+
+            return summary
+
+        return run
+
 class SendTokensAgent(AutoTxAgent):
     name = name
     system_message = system_message
@@ -138,4 +183,5 @@ class SendTokensAgent(AutoTxAgent):
     tools = [
         TransferTokenTool(),
         GetTokenBalanceTool(),
+        GetPortfolioBalancesTool(),
     ]
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 from decimal import Decimal
 from textwrap import dedent
 from typing import Annotated, Any, Callable, Coroutine
@@ -81,7 +82,9 @@ def get_tokens_address(token_in: str, token_out: str, network_info: NetworkInfo)
 class InvalidInput(Exception):
     pass
 
-async def swap(autotx: AutoTx, token_to_sell: str, token_to_buy: str) -> Intent:
+MAX_CONCURRENT_SWAPS = 4
+
+async def prepare_swap(autotx: AutoTx, token_to_sell: str, token_to_buy: str) -> Intent:
     sell_parts = token_to_sell.split(" ")
     buy_parts = token_to_buy.split(" ")
 
@@ -139,6 +142,11 @@ async def swap(autotx: AutoTx, token_to_sell: str, token_to_buy: str) -> Intent:
             amount=float(exact_amount),
         )
 
+    return swap_intent
+
+async def swap(autotx: AutoTx, token_to_sell: str, token_to_buy: str) -> Intent:
+    swap_intent = await prepare_swap(autotx, token_to_sell, token_to_buy)
+
     autotx.add_intents([swap_intent])
 
     return swap_intent
@@ -164,19 +172,34 @@ class BulkSwapTool(AutoTxTool):
                 """
             ],
         ) -> str:
-            swaps = tokens.split("\n")
+            swaps = [swap_str.strip().split(" to ") for swap_str in tokens.split("\n")]
             all_intents = []
             all_errors: list[Exception] = []
 
-            for swap_str in swaps:
-                (token_to_sell, token_to_buy) = swap_str.strip().split(" to ")
-                try:
-                    intent = await swap(autotx, token_to_sell, token_to_buy)
-                    all_intents.append(intent)
-                except InvalidInput as e:
-                    all_errors.append(e)
-                except Exception as e:
-                    all_errors.append(Exception(f"Error: {e} for swap \"{token_to_sell} to {token_to_buy}\""))
+            # Swaps are validated and quoted concurrently, then their intents are added in the given order
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_SWAPS)
+
+            async def prepare(token_to_sell: str, token_to_buy: str) -> Intent:
+                async with semaphore:
+                    return await prepare_swap(autotx, token_to_sell, token_to_buy)
+
+            results = await asyncio.gather(
+                *[prepare(token_to_sell, token_to_buy) for (token_to_sell, token_to_buy) in swaps],
+                return_exceptions=True,
+            )
+
+            for ((token_to_sell, token_to_buy), result) in zip(swaps, results):
+                if isinstance(result, InvalidInput):
+                    all_errors.append(result)
+                elif isinstance(result, Exception):
+                    all_errors.append(Exception(f"Error: {result} for swap \"{token_to_sell} to {token_to_buy}\""))
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    all_intents.append(result)
+
+            if all_intents:
+                autotx.add_intents(all_intents)
 
 
             summary = "".join(
@@ -20,6 +20,7 @@ from autotx.smart_accounts.smart_account import SmartAccount
 from autotx.utils.configuration import AppConfig
 from autotx.utils.is_dev_env import is_dev_env
 from autotx.setup import print_agent_address, setup_agents
+from autotx.task_scheduler import MAX_CONCURRENT_TASKS, MAX_QUEUED_TASKS
 from autotx.AutoTx import AutoTx, Config
 from autotx.utils.ethereum.helpers.show_address_balances import show_address_balances
 from autotx.smart_accounts.smart_account import SmartAccount
@@ -106,12 +107,14 @@ def run(prompt: str | None, non_interactive: bool, verbose: bool, logs: str | No
 @click.option("-c", "--cache", is_flag=True, help="Use cache for LLM requests")
 @click.option("-p", "--port", type=int, help="Port to run the server on")
 @click.option("-d", "--dev", is_flag=True, help="Run the server in development mode")
-def serve(verbose: bool, logs: str | None, max_rounds: int | None, cache: bool, port: int | None, dev: bool) -> None:
+@click.option("--max-concurrent-tasks", type=int, default=MAX_CONCURRENT_TASKS, help="Maximum number of tasks running at once")
+@click.option("--max-queued-tasks", type=int, default=MAX_QUEUED_TASKS, help="Maximum number of tasks waiting to run before new ones are rejected")
+def serve(verbose: bool, logs: str | None, max_rounds: int | None, cache: bool, port: int | None, dev: bool, max_concurrent_tasks: int, max_queued_tasks: int) -> None:
     from autotx.server import setup_server
     
     print_autotx_info()
 
-    setup_server(verbose, logs, max_rounds, cache, dev, check_valid_safe=True)
+    setup_server(verbose, logs, max_rounds, cache, dev, check_valid_safe=True, max_concurrent_tasks=max_concurrent_tasks, max_queued_tasks=max_queued_tasks)
     uvicorn.run("autotx.server:app", host="localhost", port=port if port else 8000, workers=1)
 
 @main.command()
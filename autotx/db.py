@@ -1,6 +1,9 @@
+import asyncio
+import base64
 from datetime import datetime
 import json
 import os
+import threading
 from typing import Any, cast
 import uuid
 from pydantic import BaseModel
@@ -11,7 +14,7 @@ from supabase.lib.client_options import ClientOptions
 from autotx import models
 from autotx.intents import load_intent
 from autotx.transactions import Transaction, TransactionBase
-from autotx.utils.dump_pydantic_list import dump_pydantic_list
+from autotx.utils.ttl_cache import TTLCache
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
@@ -22,7 +25,52 @@ if not SUPABASE_URL:
 if not SUPABASE_KEY:
     raise Exception("No supabase service role key provided")
 
-def get_db_client(schema: str) -> Client:
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "4"))
+
+# Process-wide pool of supabase clients per schema.
+# Each client keeps its own HTTP session (and its keep-alive connections) open,
+# so reusing them avoids setting up a new connection for every query.
+class ClientPool:
+    size: int
+    hits: int
+    misses: int
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise Exception("Supabase client pool size must be at least 1")
+
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._clients: dict[str, list[Client]] = {}
+        self._next: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, schema: str) -> Client:
+        with self._lock:
+            clients = self._clients.setdefault(schema, [])
+
+            if len(clients) < self.size:
+                self.misses += 1
+                client = create_db_client(schema)
+                clients.append(client)
+                return client
+
+            self.hits += 1
+            index = self._next.get(schema, 0)
+            self._next[schema] = (index + 1) % len(clients)
+            return clients[index]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "clients": sum(len(clients) for clients in self._clients.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+def create_db_client(schema: str) -> Client:
     if not SUPABASE_URL:
         raise Exception("No supabase url provided")
 
@@ -32,31 +80,122 @@ def get_db_client(schema: str) -> Client:
     options = ClientOptions(schema=schema)
     return create_client(SUPABASE_URL, SUPABASE_KEY, options)
 
+client_pool = ClientPool(SUPABASE_POOL_SIZE)
+
+APP_CACHE_TTL_SEC = float(os.getenv("APP_CACHE_TTL_SEC", "60"))
+APP_CACHE_MAX_SIZE = int(os.getenv("APP_CACHE_MAX_SIZE", "10000"))
+
+# Apps by api key and app users by (app id, user id), looked up on every authorized request.
+# Only found records are cached, so newly created ones are visible right away. Apps are allowed or revoked by
+# updating apps.allowed in the database, which the server is not told about: a change is only seen by a running
+# server once the cached record expires, up to APP_CACHE_TTL_SEC later.
+app_cache: TTLCache[models.App] = TTLCache(APP_CACHE_TTL_SEC, APP_CACHE_MAX_SIZE)
+app_user_cache: TTLCache[models.AppUser] = TTLCache(APP_CACHE_TTL_SEC, APP_CACHE_MAX_SIZE)
+
+def get_db_client(schema: str) -> Client:
+    return client_pool.get(schema)
+
+TASK_SELECT = "*, task_messages(message), task_logs(type, obj, created_at)"
+TASK_SUMMARY_COLUMNS = "id, prompt, address, chain_id, created_at, updated_at, running, queued, error, intents, previous_task_id, feedback"
+TASKS_PAGE_DEFAULT_LIMIT = 50
+TASKS_PAGE_MAX_LIMIT = 500
+
+class InvalidCursor(Exception):
+    pass
+
+def encode_tasks_cursor(created_at: str, task_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([created_at, task_id]).encode()).decode()
+
+def decode_tasks_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(created_at, str):
+            raise ValueError()
+        uuid.UUID(task_id)
+    except Exception:
+        raise InvalidCursor(f"Invalid cursor: {cursor}")
+
+    return (created_at, task_id)
+
+def tasks_page_columns(include_messages: bool, include_logs: bool) -> str:
+    columns = TASK_SUMMARY_COLUMNS
+    if include_messages:
+        columns += ", task_messages(message)"
+    if include_logs:
+        columns += ", task_logs(type, obj, created_at)"
+    return columns
+
+def select_tasks_page(query: Any, limit: int | None, cursor: str | None, include_messages: bool, include_logs: bool) -> models.TaskPage:
+    if cursor:
+        (created_at, task_id) = decode_tasks_cursor(cursor)
+        query = query.or_(f'created_at.gt."{created_at}",and(created_at.eq."{created_at}",id.gt.{task_id})')
+    if include_messages:
+        query = query.order("id", foreign_table="task_messages")
+    if include_logs:
+        query = query.order("id", foreign_table="task_logs")
+
+    # Order by created_at with id as tiebreaker
+    query = query.order("created_at,id")
+
+    if limit is None:
+        # Not paginated: every task is returned
+        return models.TaskPage(tasks=[build_task(task_data) for task_data in query.execute().data], next_cursor=None)
+
+    # Fetch one extra row to know if there is a next page
+    limit = max(1, min(limit, TASKS_PAGE_MAX_LIMIT))
+    result = query.limit(limit + 1).execute()
+
+    rows = result.data[:limit]
+    next_cursor = encode_tasks_cursor(rows[-1]["created_at"], rows[-1]["id"]) if len(result.data) > limit else None
+
+    return models.TaskPage(
+        tasks=[build_task(task_data) for task_data in rows],
+        next_cursor=next_cursor
+    )
+
+def build_task(task_data: dict[str, Any]) -> models.Task:
+    return models.Task(
+        id=task_data["id"],
+        prompt=task_data["prompt"],
+        address=task_data["address"],
+        chain_id=task_data["chain_id"],
+        created_at=task_data["created_at"],
+        updated_at=task_data["updated_at"],
+        running=task_data["running"],
+        queued=task_data["queued"],
+        error=task_data["error"],
+        # Messages and logs are None when they were not selected
+        messages=[message["message"] for message in task_data["task_messages"]] if "task_messages" in task_data else None,
+        logs=[models.TaskLog(**log) for log in task_data["task_logs"]] if "task_logs" in task_data else None,
+        intents=[load_intent(intent) for intent in task_data["intents"]],
+        previous_task_id=task_data["previous_task_id"],
+        feedback=task_data["feedback"]
+    )
+
+# The a_ variants run the same queries on a worker thread so async routes don't block the event loop
 class TasksRepository:
     def __init__(self, app_id: str):
         self.client = get_db_client("public")
         self.app_id = app_id
 
+    # Creates the task as queued, set_running marks it as running once it gets a slot
     def start(self, prompt: str, address: str, chain_id: int, app_user_id: str, previous_task_id: str | None = None) -> models.Task:
-        client = get_db_client("public")
-
         created_at = datetime.utcnow()
         updated_at = datetime.utcnow()
 
-        result = client.table("tasks").insert(
+        result = self.client.table("tasks").insert(
             {
                 "app_id": self.app_id,
                 "app_user_id": app_user_id,
                 "prompt": prompt,
                 "address": address,
                 "chain_id": chain_id,
-                "running": True,
+                "running": False,
+                "queued": True,
                 "error": None,
                 "created_at": str(created_at),
                 "updated_at": str(updated_at),
-                "messages": json.dumps([]),
-                "logs": json.dumps([]),
-                "intents": json.dumps([]),
+                "intents": [],
                 "previous_task_id": previous_task_id,
                 "feedback": None
             }
@@ -69,7 +208,8 @@ class TasksRepository:
             chain_id=chain_id,
             created_at=created_at,
             updated_at=updated_at,
-            running=True,
+            running=False,
+            queued=True,
             error=None,
             messages=[],
             logs=[],
@@ -78,129 +218,178 @@ class TasksRepository:
             feedback=None
         )
 
+    async def a_start(self, prompt: str, address: str, chain_id: int, app_user_id: str, previous_task_id: str | None = None) -> models.Task:
+        return await asyncio.to_thread(self.start, prompt, address, chain_id, app_user_id, previous_task_id)
+
+    def set_running(self, task_id: str) -> None:
+        self.client.table("tasks").update(
+            {
+                "running": True,
+                "queued": False,
+                "updated_at": str(datetime.utcnow())
+            }
+        ).eq("id", task_id).eq("app_id", self.app_id).execute()
+
+    async def a_set_running(self, task_id: str) -> None:
+        await asyncio.to_thread(self.set_running, task_id)
+
     def stop(self, task_id: str) -> None:
-        client = get_db_client("public")
+        self.client.table("tasks").update(
+            {
+                "running": False,
+                "queued": False,
+                "updated_at": str(datetime.utcnow())
+            }
+        ).eq("id", task_id).eq("app_id", self.app_id).execute()
 
-        client.table("tasks").update(
+    async def a_stop(self, task_id: str) -> None:
+        await asyncio.to_thread(self.stop, task_id)
+
+    def stop_with_error(self, task_id: str, error: str) -> None:
+        self.client.table("tasks").update(
             {
                 "running": False,
+                "queued": False,
+                "error": error,
                 "updated_at": str(datetime.utcnow())
             }
         ).eq("id", task_id).eq("app_id", self.app_id).execute()
 
-    def update(self, task: models.Task) -> None:
-        client = get_db_client("public")
+    async def a_stop_with_error(self, task_id: str, error: str) -> None:
+        await asyncio.to_thread(self.stop_with_error, task_id, error)
 
-        client.table("tasks").update(
+    def update(self, task: models.Task) -> None:
+        # Messages and logs are append-only, see add_message and add_log
+        self.client.table("tasks").update(
             {
                 "prompt": task.prompt,
                 "running": task.running,
                 "updated_at": str(datetime.utcnow()),
-                "messages": json.dumps(task.messages),
                 "error": task.error,
-                "logs": dump_pydantic_list(task.logs if task.logs else []),
-                "intents": dump_pydantic_list(task.intents),
+                "intents": [json.loads(intent.model_dump_json()) for intent in task.intents],
                 "previous_task_id": task.previous_task_id
             }
         ).eq("id", task.id).eq("app_id", self.app_id).execute()
+
+    async def a_update(self, task: models.Task) -> None:
+        await asyncio.to_thread(self.update, task)
+
+    def add_message(self, task_id: str, message: str) -> None:
+        self.add_messages(task_id, [message])
+
+    def add_messages(self, task_id: str, messages: list[str]) -> None:
+        if len(messages) == 0:
+            return
+
+        created_at = str(datetime.utcnow())
+        self.client.table("task_messages").insert(
+            [
+                {
+                    "task_id": task_id,
+                    "message": message,
+                    "created_at": created_at
+                }
+                for message in messages
+            ]
+        ).execute()
+
+    def add_log(self, task_id: str, log: models.TaskLog) -> None:
+        self.add_logs(task_id, [log])
+
+    def add_logs(self, task_id: str, logs: list[models.TaskLog]) -> None:
+        if len(logs) == 0:
+            return
+
+        self.client.table("task_logs").insert(
+            [
+                {
+                    "task_id": task_id,
+                    "type": log.type,
+                    "obj": log.obj,
+                    "created_at": str(log.created_at)
+                }
+                for log in logs
+            ]
+        ).execute()
     
     def update_feedback(self, task_id: str, feedback: str) -> None:
-        client = get_db_client("public")
-
-        client.table("tasks").update(
+        self.client.table("tasks").update(
             {
                 "feedback": feedback
             }
         ).eq("id", task_id).eq("app_id", self.app_id).execute()
 
-    def get(self, task_id: str) -> models.Task | None:
-        client = get_db_client("public")
+    async def a_update_feedback(self, task_id: str, feedback: str) -> None:
+        await asyncio.to_thread(self.update_feedback, task_id, feedback)
 
-        result = client.table("tasks") \
-            .select("*") \
+    def get(self, task_id: str) -> models.Task | None:
+        result = self.client.table("tasks") \
+            .select(TASK_SELECT) \
             .eq("id", task_id) \
             .eq("app_id", self.app_id) \
+            .order("id", foreign_table="task_messages") \
+            .order("id", foreign_table="task_logs") \
             .execute()
 
         if len(result.data) == 0:
             return None
 
-        task_data = result.data[0]
+        return build_task(result.data[0])
 
-        return models.Task(
-            id=task_data["id"],
-            prompt=task_data["prompt"],
-            address=task_data["address"],
-            chain_id=task_data["chain_id"],
-            created_at=task_data["created_at"],
-            updated_at=task_data["updated_at"],
-            running=task_data["running"],
-            error=task_data["error"],
-            messages=json.loads(task_data["messages"]),
-            logs=[models.TaskLog(**log) for log in json.loads(task_data["logs"])] if task_data["logs"] else None,
-            intents=[load_intent(intent) for intent in json.loads(task_data["intents"])],
-            previous_task_id=task_data["previous_task_id"],
-            feedback=task_data["feedback"]
-        )
+    async def a_get(self, task_id: str) -> models.Task | None:
+        return await asyncio.to_thread(self.get, task_id)
 
-    def get_all(self) -> list[models.Task]:
-        client = get_db_client("public")
-
-        result = client.table("tasks").select("*").eq("app_id", self.app_id).execute()
-
-        tasks = []
-
-        for task_data in result.data:
-            tasks.append(
-                models.Task(
-                    id=task_data["id"],
-                    prompt=task_data["prompt"],
-                    address=task_data["address"],
-                    chain_id=task_data["chain_id"],
-                    created_at=task_data["created_at"],
-                    updated_at=task_data["updated_at"],
-                    running=task_data["running"],
-                    error=task_data["error"],
-                    messages=json.loads(task_data["messages"]),
-                    logs=[models.TaskLog(**log) for log in json.loads(task_data["logs"])] if task_data["logs"] else None,
-                    intents=[load_intent(intent) for intent in json.loads(task_data["intents"])],
-                    previous_task_id=task_data["previous_task_id"],
-                    feedback=task_data["feedback"]
-                )
+    # Returns the task followed by its previous tasks, newest first
+    def get_history(self, task_id: str) -> list[models.TaskHistoryItem]:
+        result = self.client.rpc(
+            "get_task_history",
+            {
+                "history_task_id": task_id,
+                "history_app_id": self.app_id
+            }
+        ).execute()
+
+        return [
+            models.TaskHistoryItem(
+                id=task_data["id"],
+                prompt=task_data["prompt"],
+                intents=[load_intent(intent) for intent in task_data["intents"]],
+                previous_task_id=task_data["previous_task_id"],
+                feedback=task_data["feedback"]
             )
+            for task_data in result.data
+        ]
+
+    async def a_get_history(self, task_id: str) -> list[models.TaskHistoryItem]:
+        return await asyncio.to_thread(self.get_history, task_id)
+
+    # limit=None returns every task, otherwise a page of at most limit tasks starting after cursor
+    def get_all(self, limit: int | None = None, cursor: str | None = None, include_messages: bool = False, include_logs: bool = False) -> models.TaskPage:
+        query = self.client.table("tasks") \
+            .select(tasks_page_columns(include_messages, include_logs)) \
+            .eq("app_id", self.app_id)
+
+        return select_tasks_page(query, limit, cursor, include_messages, include_logs)
 
-        return tasks
+    async def a_get_all(self, limit: int | None = None, cursor: str | None = None, include_messages: bool = False, include_logs: bool = False) -> models.TaskPage:
+        return await asyncio.to_thread(self.get_all, limit, cursor, include_messages, include_logs)
     
-    def get_from_user(self, app_user_id: str) -> list[models.Task]:
-        client = get_db_client("public")
-
-        result = client.table("tasks").select("*").eq("app_id", self.app_id).eq("app_user_id", app_user_id).execute()
-
-        tasks = []
-
-        for task_data in result.data:
-            tasks.append(
-                models.Task(
-                    id=task_data["id"],
-                    app_user_id=task_data["app_user_id"],
-                    prompt=task_data["prompt"],
-                    address=task_data["address"],
-                    chain_id=task_data["chain_id"],
-                    created_at=task_data["created_at"],
-                    updated_at=task_data["updated_at"],
-                    running=task_data["running"],
-                    error=task_data["error"],
-                    messages=json.loads(task_data["messages"]),
-                    logs=[models.TaskLog(**log) for log in json.loads(task_data["logs"])] if task_data["logs"] else None,
-                    intents=[load_intent(intent) for intent in json.loads(task_data["intents"])],
-                    previous_task_id=task_data["previous_task_id"],
-                    feedback=task_data["feedback"]
-                )
-            )
+    def get_from_user(self, app_user_id: str, limit: int | None = None, cursor: str | None = None, include_messages: bool = False, include_logs: bool = False) -> models.TaskPage:
+        query = self.client.table("tasks") \
+            .select(tasks_page_columns(include_messages, include_logs)) \
+            .eq("app_id", self.app_id) \
+            .eq("app_user_id", app_user_id)
 
-        return tasks
+        return select_tasks_page(query, limit, cursor, include_messages, include_logs)
+
+    async def a_get_from_user(self, app_user_id: str, limit: int | None = None, cursor: str | None = None, include_messages: bool = False, include_logs: bool = False) -> models.TaskPage:
+        return await asyncio.to_thread(self.get_from_user, app_user_id, limit, cursor, include_messages, include_logs)
     
 def get_app_by_api_key(api_key: str) -> models.App | None:
+    cached_app = app_cache.get(api_key)
+    if cached_app is not None:
+        return cached_app
+
     client = get_db_client("public")
 
     result = client.table("apps").select("*").eq("api_key", api_key).execute()
@@ -210,12 +399,18 @@ def get_app_by_api_key(api_key: str) -> models.App | None:
 
     app_data = result.data[0]
 
-    return models.App(
+    app = models.App(
         id=app_data["id"],
         name=app_data["name"],
         api_key=app_data["api_key"],
         allowed=app_data["allowed"]
     )
+    app_cache.set(api_key, app)
+
+    return app
+
+async def a_get_app_by_api_key(api_key: str) -> models.App | None:
+    return await asyncio.to_thread(get_app_by_api_key, api_key)
 
 
 def create_app_user(app_id: str, user_id: str, agent_address: str, agent_private_key: str) -> models.AppUser: 
@@ -232,15 +427,25 @@ def create_app_user(app_id: str, user_id: str, agent_address: str, agent_private
         }
     ).execute()
 
-    return models.AppUser(
+    app_user = models.AppUser(
         id=result.data[0]["id"],
         user_id=user_id,
         agent_address=agent_address,
         created_at=created_at,
         app_id=app_id
     )
+    app_user_cache.set((app_id, user_id), app_user)
+
+    return app_user
+
+async def a_create_app_user(app_id: str, user_id: str, agent_address: str, agent_private_key: str) -> models.AppUser:
+    return await asyncio.to_thread(create_app_user, app_id, user_id, agent_address, agent_private_key)
 
 def get_app_user(app_id: str, user_id: str) -> models.AppUser | None:
+    cached_app_user = app_user_cache.get((app_id, user_id))
+    if cached_app_user is not None:
+        return cached_app_user
+
     client = get_db_client("public")
 
     result = client.table("app_users") \
@@ -254,13 +459,19 @@ def get_app_user(app_id: str, user_id: str) -> models.AppUser | None:
 
     app_user_data = result.data[0]
 
-    return models.AppUser(
+    app_user = models.AppUser(
         id = app_user_data["id"],
         user_id=app_user_data["user_id"],
         agent_address=app_user_data["agent_address"],
         created_at=app_user_data["created_at"],
         app_id=app_user_data["app_id"]
     )
+    app_user_cache.set((app_id, user_id), app_user)
+
+    return app_user
+
+async def a_get_app_user(app_id: str, user_id: str) -> models.AppUser | None:
+    return await asyncio.to_thread(get_app_user, app_id, user_id)
 
 def get_agent_private_key(app_id: str, user_id: str) -> str | None:
     client = get_db_client("public")
@@ -276,6 +487,9 @@ def get_agent_private_key(app_id: str, user_id: str) -> str | None:
 
     return str(result.data[0]["agent_private_key"])
 
+async def a_get_agent_private_key(app_id: str, user_id: str) -> str | None:
+    return await asyncio.to_thread(get_agent_private_key, app_id, user_id)
+
 def save_transactions(app_id: str, address: str, chain_id: int, app_user_id: str, task_id: str, transactions: list[Transaction]) -> str:
     client = get_db_client("public")
     
@@ -291,12 +505,15 @@ def save_transactions(app_id: str, address: str, chain_id: int, app_user_id: str
                 "app_user_id": app_user_id,
                 "task_id": task_id,
                 "created_at": str(created_at),
-                "transactions": json.dumps(txs)
+                "transactions": txs
             }
         ).execute()
     
     return cast(str, result.data[0]["id"])
 
+async def a_save_transactions(app_id: str, address: str, chain_id: int, app_user_id: str, task_id: str, transactions: list[Transaction]) -> str:
+    return await asyncio.to_thread(save_transactions, app_id, address, chain_id, app_user_id, task_id, transactions)
+
 def get_transactions(app_id: str, app_user_id: str, task_id: str, address: str, chain_id: int, submitted_batch_id: str) -> tuple[list[TransactionBase], str] | None:
     client = get_db_client("public")
 
@@ -314,10 +531,13 @@ def get_transactions(app_id: str, app_user_id: str, task_id: str, address: str,
         return None
     
     return (
-        [TransactionBase(**tx) for tx in json.loads(result.data[0]["transactions"])], 
+        [TransactionBase(**tx) for tx in result.data[0]["transactions"]], 
         result.data[0]["task_id"]    
     )
 
+async def a_get_transactions(app_id: str, app_user_id: str, task_id: str, address: str, chain_id: int, submitted_batch_id: str) -> tuple[list[TransactionBase], str] | None:
+    return await asyncio.to_thread(get_transactions, app_id, app_user_id, task_id, address, chain_id, submitted_batch_id)
+
 def get_submitted_transactions_from_user(
     app_id: str,
     app_user_id: str,
@@ -338,11 +558,14 @@ def get_submitted_transactions_from_user(
     submitted_batches = []
     for batch in result.data:
         submitted_batches.append(
-            [TransactionBase(**tx) for tx in json.loads(batch["transactions"])]
+            [TransactionBase(**tx) for tx in batch["transactions"]]
         )
 
     return submitted_batches
 
+async def a_get_submitted_transactions_from_user(app_id: str, app_user_id: str) -> list[list[TransactionBase]]:
+    return await asyncio.to_thread(get_submitted_transactions_from_user, app_id, app_user_id)
+
 def submit_transactions(app_id: str, app_user_id: str, submitted_batch_id: str) -> None:
     client = get_db_client("public")
     
@@ -355,6 +578,9 @@ def submit_transactions(app_id: str, app_user_id: str, submitted_batch_id: str)
         .eq("app_user_id", app_user_id) \
         .eq("id", submitted_batch_id) \
         .execute()
+
+async def a_submit_transactions(app_id: str, app_user_id: str, submitted_batch_id: str) -> None:
+    await asyncio.to_thread(submit_transactions, app_id, app_user_id, submitted_batch_id)
     
 def add_task_error(context: str, app_id: str, app_user_id: str, task_id: str, message: str) -> None:
     client = get_db_client("public")
@@ -371,6 +597,9 @@ def add_task_error(context: str, app_id: str, app_user_id: str, task_id: str, me
         }
     ).execute()
 
+async def a_add_task_error(context: str, app_id: str, app_user_id: str, task_id: str, message: str) -> None:
+    await asyncio.to_thread(add_task_error, context, app_id, app_user_id, task_id, message)
+
 class SubmittedBatch(BaseModel):
     id: str
     app_id: str
@@ -404,7 +633,7 @@ def get_submitted_batches(app_id: str, task_id: str) -> list[SubmittedBatch]:
                 task_id=batch_data["task_id"],
                 created_at=batch_data["created_at"],
                 submitted_on=batch_data["submitted_on"],
-                transactions=json.loads(batch_data["transactions"])
+                transactions=batch_data["transactions"]
             )
         )
 
@@ -414,16 +643,18 @@ def get_task_logs(task_id: str) -> list[models.TaskLog] | None:
     client = get_db_client("public")
 
     result = client.table("tasks") \
-        .select("logs") \
+        .select("id, task_logs(type, obj, created_at)") \
         .eq("id", task_id) \
+        .order("id", foreign_table="task_logs") \
         .execute()
 
     if len(result.data) == 0:
         return None
 
-    task_data = result.data[0]
+    return [models.TaskLog(**log) for log in result.data[0]["task_logs"]]
 
-    return [models.TaskLog(**log) for log in json.loads(task_data["logs"])] if task_data["logs"] else []
+async def a_get_task_logs(task_id: str) -> list[models.TaskLog] | None:
+    return await asyncio.to_thread(get_task_logs, task_id)
 
 def create_app(name: str, api_key: str) -> models.App:
     client = get_db_client("public")
@@ -436,6 +667,8 @@ def create_app(name: str, api_key: str) -> models.App:
         }
     ).execute()
 
+    app_cache.invalidate(api_key)
+
     return models.App(
         id=result.data[0]["id"],
         name=name,
@@ -451,4 +684,7 @@ def clear_db() -> None:
     client.table("apps").delete().neq("id", uid).execute()
     client.table("app_users").delete().neq("id", uid).execute()
     client.table("tasks").delete().neq("id", uid).execute()
-    client.table("submitted_batches").delete().neq("id", uid).execute()
\ No newline at end of file
+    client.table("submitted_batches").delete().neq("id", uid).execute()
+
+    app_cache.clear()
+    app_user_cache.clear()
\ No newline at end of file
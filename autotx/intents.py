@@ -1,4 +1,5 @@
 from abc import abstractmethod
+import asyncio
 from decimal import Decimal
 from enum import Enum
 from pydantic import BaseModel
@@ -17,6 +18,8 @@ from autotx.utils.ethereum.lifi.swap import a_build_swap_transaction
 from autotx.utils.ethereum.networks import NetworkInfo
 from autotx.utils.format_amount import format_amount
 
+MAX_CONCURRENT_INTENT_BUILDS = 4
+
 class IntentType(str, Enum):
     SEND = "send"
     BUY = "buy"
@@ -44,14 +47,15 @@ class SendIntent(IntentBase):
             receiver=receiver.original_str,
             summary=f"Transfer {format_amount(amount)} {token.symbol} to {receiver}",
         )
-    
+
     async def build_transactions(self, web3: Web3, network: NetworkInfo, smart_wallet_address: ETHAddress) -> list[Transaction]:
         tx: TxParams
 
+        # The RPC calls are made from a thread so that intents built concurrently are not serialized on the event loop
         if self.token.address == NATIVE_TOKEN_ADDRESS:
-            tx = build_transfer_native(web3, smart_wallet_address, ETHAddress(self.receiver), self.amount)
+            tx = await asyncio.to_thread(build_transfer_native, web3, smart_wallet_address, ETHAddress(self.receiver), self.amount)
         else:
-            tx = build_transfer_erc20(web3, ETHAddress(self.token.address), ETHAddress(self.receiver), self.amount, smart_wallet_address)
+            tx = await asyncio.to_thread(build_transfer_erc20, web3, ETHAddress(self.token.address), ETHAddress(self.receiver), self.amount, smart_wallet_address)
             
         transactions: list[Transaction] = [
             SendTransaction.create(
@@ -78,7 +82,7 @@ class BuyIntent(IntentBase):
             amount=amount,
             summary=f"Buy {format_amount(amount)} {to_token.symbol} with {from_token.symbol}",
         )
-    
+
     async def build_transactions(self, web3: Web3, network: NetworkInfo, smart_wallet_address: ETHAddress) -> list[Transaction]:
         transactions = await a_build_swap_transaction(
             web3,
@@ -106,9 +110,8 @@ class SellIntent(IntentBase):
             amount=amount,
             summary=f"Sell {format_amount(amount)} {from_token.symbol} for {to_token.symbol}",
         )    
-    
-    async def build_transactions(self, web3: Web3, network: NetworkInfo, smart_wallet_address: ETHAddress) -> list[Transaction]:
 
+    async def build_transactions(self, web3: Web3, network: NetworkInfo, smart_wallet_address: ETHAddress) -> list[Transaction]:
         transactions = await a_build_swap_transaction(
             web3,
             Decimal(str(self.amount)),
@@ -123,6 +126,32 @@ class SellIntent(IntentBase):
 
 Intent = Union[SendIntent, BuyIntent, SellIntent]
 
+async def build_intents_transactions(
+    intents: list[Intent],
+    web3: Web3,
+    network: NetworkInfo,
+    smart_wallet_address: ETHAddress,
+    max_concurrency: int = MAX_CONCURRENT_INTENT_BUILDS,
+) -> list[Transaction]:
+    # Intents are built concurrently: each build only reads its own intent, whose amounts are fixed when it is
+    # created, so no build needs the outcome of another. The transactions keep the order of the intents.
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def build(intent: Intent) -> list[Transaction]:
+        async with semaphore:
+            return await intent.build_transactions(web3, network, smart_wallet_address)
+
+    results = await asyncio.gather(*[build(intent) for intent in intents], return_exceptions=True)
+
+    transactions: list[Transaction] = []
+    for result in results:
+        # Raises the error of the first intent that failed, whatever the order in which the builds finished
+        if isinstance(result, BaseException):
+            raise result
+        transactions.extend(result)
+
+    return transactions
+
 def load_intent(intent_data: dict[str, Any]) -> Intent:
     if intent_data["type"] == "send":
         return SendIntent.create(
@@ -1,9 +1,11 @@
 import asyncio
 import json
-from textwrap import dedent
+import os
 from typing import Union
 import aiohttp
 
+from autotx.utils.ethereum.helpers.token_list import TOKEN_LISTS_DIR, get_token_list_path
+
 KLEROS_TOKENS_LIST = "https://t2crtokens.eth.link/"
 COINGECKO_TOKENS_LISTS = [
     "https://tokens.coingecko.com/uniswap/all.json",
@@ -32,15 +34,21 @@ async def fetch_tokens_list() -> None:
         except:
             print("Error while trying to fetch list:", token_list_url)
 
-    loaded_tokens_as_string = json.dumps(loaded_tokens, indent=2)
-    content = dedent(
-        f"""# THIS IS AN AUTOGENERATED FILE. DO NOT MODIFY MANUALLY, PLEASE CHECK autotx/load_tokens.py TO DO ANY MODIFICATIONS
-
-token_list = {loaded_tokens_as_string}
-"""
-    )
-    with open("autotx/utils/ethereum/helpers/token_list.py", "w") as f:
-        f.write(content)
+    tokens_per_chain: dict[int, list[list[Union[str, int]]]] = {}
+    for token in loaded_tokens:
+        tokens_per_chain.setdefault(int(token["chainId"]), []).append(
+            [token["symbol"], token["address"], token["name"], token["decimals"]]
+        )
+
+    os.makedirs(TOKEN_LISTS_DIR, exist_ok=True)
+    for file_name in os.listdir(TOKEN_LISTS_DIR):
+        if file_name.endswith(".json"):
+            os.remove(os.path.join(TOKEN_LISTS_DIR, file_name))
+
+    # One token per line keeps the generated files readable in diffs
+    for chain_id, tokens in tokens_per_chain.items():
+        with open(get_token_list_path(chain_id), "w", encoding="utf-8") as f:
+            f.write("[\n" + ",\n".join(json.dumps(token, separators=(",", ":"), ensure_ascii=False) for token in tokens) + "\n]\n")
 
 
 def run() -> None:
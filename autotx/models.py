@@ -18,11 +18,27 @@ class Task(BaseModel):
     updated_at: datetime
     error: str | None
     running: bool
-    messages: List[str]
+    # Waiting in the execution queue, neither running nor finished
+    queued: bool = False
+    # Messages and logs are None when they were not selected, see GET /api/v1/tasks
+    messages: List[str] | None
     logs: List[TaskLog] | None
     intents: List[Intent]
     previous_task_id: str | None
     feedback: str | None
+    # Position in the execution queue while the task waits for a free slot
+    queue_position: int | None = None
+
+class TaskHistoryItem(BaseModel):
+    id: str
+    prompt: str
+    intents: List[Intent]
+    previous_task_id: str | None
+    feedback: str | None
+
+class TaskPage(BaseModel):
+    tasks: List[Task]
+    next_cursor: str | None
 
 class TaskError(BaseModel):
     id: str
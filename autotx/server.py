@@ -1,24 +1,35 @@
+import asyncio
 from datetime import datetime
 import json
-from typing import Annotated, Any, Dict, List
+from typing import Annotated, Any, AsyncIterator, Dict, List
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 from gnosis.safe.api.base_api import SafeAPIException
-from fastapi import APIRouter, FastAPI, BackgroundTasks, HTTPException, Header
+from fastapi import APIRouter, FastAPI, BackgroundTasks, HTTPException, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 import traceback
 
-from autotx import models, setup, task_logs
+from autotx import models, setup, task_events, task_logs
 from autotx import db
 from autotx.AutoTx import AutoTx, Config as AutoTxConfig
-from autotx.intents import Intent
+from autotx.intents import Intent, build_intents_transactions
 from autotx.smart_accounts.smart_account import SmartAccount
+from autotx import task_log_sink
+from autotx.task_log_sink import TaskLogSink
+from autotx.task_scheduler import MAX_CONCURRENT_TASKS, MAX_QUEUED_TASKS, ScheduledTask, TaskQueueFull, task_scheduler
 from autotx.transactions import Transaction
-from autotx.utils.configuration import AppConfig
+from autotx.utils import coingecko
+from autotx.utils.coingecko.coin_list import coin_list
+from autotx.utils.coingecko.response_cache import coingecko_responses
+from autotx.utils.coingecko.symbol_index import warm_symbol_search_index
+from autotx.utils.configuration import AppConfig, app_configs
 from autotx.utils.ethereum.chain_short_names import CHAIN_ID_TO_SHORT_NAME
 from autotx.utils.ethereum.networks import SUPPORTED_NETWORKS_CONFIGURATION_MAP
+from autotx.utils.ethereum.lifi import Lifi
+from autotx.utils.ethereum.lifi.swap import quote_cache
+from autotx.utils.ethereum.token_metadata import token_metadata
 from autotx.smart_accounts.api_smart_account import ApiSmartAccount
 from autotx.smart_accounts.safe_smart_account import SafeSmartAccount
 
@@ -52,20 +63,36 @@ def get_task_or_404(task_id: str, tasks: db.TasksRepository) -> models.Task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
-def authorize(authorization: str | None) -> models.App:
+async def a_get_task_or_404(task_id: str, tasks: db.TasksRepository) -> models.Task:
+    task = await tasks.a_get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+def get_api_key(authorization: str | None) -> str:
     if not authorization or authorization.startswith("Bearer ") is False:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    api_key = authorization.split("Bearer ")[1]
-    app = db.get_app_by_api_key(api_key)
+    return authorization.split("Bearer ")[1]
 
+def check_app_allowed(app: models.App | None) -> models.App:
     if not app or app.allowed is False:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
     return app
 
-def load_wallet_for_user(app_config: AppConfig, app_id: str, user_id: str, address: str) -> SmartAccount:
-    agent_private_key = db.get_agent_private_key(app_id, user_id)
+def authorize(authorization: str | None) -> models.App:
+    api_key = get_api_key(authorization)
+
+    return check_app_allowed(db.get_app_by_api_key(api_key))
+
+async def a_authorize(authorization: str | None) -> models.App:
+    api_key = get_api_key(authorization)
+
+    return check_app_allowed(await db.a_get_app_by_api_key(api_key))
+
+async def load_wallet_for_user(app_config: AppConfig, app_id: str, user_id: str, address: str) -> SmartAccount:
+    agent_private_key = await db.a_get_agent_private_key(app_id, user_id)
 
     if not agent_private_key:
         raise HTTPException(status_code=400, detail="User not found")
@@ -85,59 +112,49 @@ def authorize_app_and_user(authorization: str | None, user_id: str) -> tuple[mod
 
     return (app, app_user)
 
+async def a_authorize_app_and_user(authorization: str | None, user_id: str) -> tuple[models.App, models.AppUser]:
+    app = await a_authorize(authorization)
+    app_user = await db.a_get_app_user(app.id, user_id)
+
+    if not app_user:
+        raise HTTPException(status_code=400, detail="User not found")
+
+    return (app, app_user)
+
 async def build_transactions(app_id: str, user_id: str, chain_id: int, address: str, task: models.Task) -> List[Transaction]:
-    if task.running:
+    if task.running or task.queued:
         raise HTTPException(status_code=400, detail="Task is still running")
 
-    app_config = AppConfig(subsidized_chain_id=chain_id)
-    wallet = load_wallet_for_user(app_config, app_id, user_id, address)
+    app_config = await app_configs.a_get(chain_id)
+    wallet = await load_wallet_for_user(app_config, app_id, user_id, address)
 
     if task.intents is None or len(task.intents) == 0:
         return []
 
-    transactions: list[Transaction] = []
+    return await build_intents_transactions(task.intents, app_config.web3, app_config.network_info, wallet.address)
 
-    for intent in task.intents:
-        transactions.extend(await intent.build_transactions(app_config.web3, app_config.network_info, wallet.address))
+def enqueue_task(app_id: str) -> ScheduledTask:
+    try:
+        return task_scheduler.enqueue(app_id)
+    except TaskQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
 
-    return transactions
+def with_queue_position(task: models.Task) -> models.Task:
+    task.queue_position = task_scheduler.position(task.id)
+    return task
 
 def stop_task_for_error(tasks: db.TasksRepository, task_id: str, error: str, user_error_message: str) -> None:
-    task = tasks.get(task_id)
-    if task is None:
-        raise Exception("Task not found: " + task_id)
-
-    task.error = error
-    task.running = False
-    task.messages.append(user_error_message)
-    tasks.update(task)
+    tasks.stop_with_error(task_id, error)
+    tasks.add_message(task_id, user_error_message)
 
-def log(log_type: str, obj: Any, task_id: str, tasks: db.TasksRepository) -> None:
-   add_task_log(models.TaskLog(type=log_type, obj=json.dumps(obj), created_at=datetime.now()), task_id, tasks)
+def log(log_type: str, obj: Any, sink: TaskLogSink, events: task_events.TaskEventStream) -> None:
+   task_log = models.TaskLog(type=log_type, obj=json.dumps(obj), created_at=datetime.now())
+   sink.add_log(task_log)
+   events.publish_log(task_log)
 
-def add_task_log(log: models.TaskLog, task_id: str, tasks: db.TasksRepository) -> None:
-    task = tasks.get(task_id)
-    if task is None:
-        raise Exception("Task not found: " + task_id)
 
-    if task.logs is None:
-        task.logs = []
-    task.logs.append(log)
-    tasks.update(task)
-
-
-def get_previous_tasks(task: models.Task, tasks: db.TasksRepository) -> List[models.Task]:
-    previous_tasks = []
-    current_task: models.Task | None = task
-    while current_task is not None:
-        previous_tasks.append(current_task)
-        if current_task.previous_task_id is None:
-            break
-        current_task = tasks.get(current_task.previous_task_id)
-    return previous_tasks
-
-def run_task(prompt: str, task: models.TaskCreate, app: models.App, app_user: models.AppUser, tasks: db.TasksRepository, background_tasks: BackgroundTasks, previous_task_id: str | None = None) -> models.Task:
-    app_config = AppConfig(subsidized_chain_id=task.chain_id)
+def run_task(prompt: str, task: models.TaskCreate, app: models.App, app_user: models.AppUser, tasks: db.TasksRepository, background_tasks: BackgroundTasks, scheduled: ScheduledTask, previous_task_id: str | None = None) -> models.Task:
+    app_config = app_configs.get(task.chain_id)
 
     wallet = SafeSmartAccount(app_config.rpc_url, app_config.network_info, smart_account_addr=task.address)
     api_wallet = ApiSmartAccount(app_config.web3, wallet, tasks)
@@ -145,28 +162,34 @@ def run_task(prompt: str, task: models.TaskCreate, app: models.App, app_user: mo
     created_task: models.Task = tasks.start(prompt, api_wallet.address.hex, app_config.network_info.chain_id.value, app_user.id, previous_task_id)
     task_id = created_task.id
     api_wallet.task_id = task_id
+    scheduled.task_id = task_id
+
+    sink = TaskLogSink(tasks, task_id)
+    events = task_events.create_stream(task_id, app.id)
+    api_wallet.on_intents_saved = events.publish_intents
+
+    def stop_with_error(error: str) -> None:
+        user_error_message = f"An error caused AutoTx to stop ({task_id})"
+        stop_task_for_error(tasks, task_id, error, user_error_message)
+        events.publish_message(user_error_message)
+        events.close(error)
 
     try:
         (get_llm_config, agents, logs_dir) = setup.setup_agents(autotx_params.logs, cache=autotx_params.cache)
 
         def on_notify_user(message: str) -> None:
-            task = tasks.get(task_id)
-            if task is None:
-                raise Exception("Task not found: " + task_id)
-
-            task.messages.append(message)
-            tasks.update(task)
+            sink.add_message(message)
+            events.publish_message(message)
 
         def on_agent_message(from_agent: str, to_agent: str, message: Any) -> None:
-            add_task_log(
-                task_logs.build_agent_message_log(from_agent, to_agent, message),
-                task_id,
-                tasks
-            )
+            agent_message_log = task_logs.build_agent_message_log(from_agent, to_agent, message)
+            sink.add_log(agent_message_log)
+            events.publish_log(agent_message_log)
 
         autotx = AutoTx(
             app_config.web3,
             api_wallet,
+            # The registry gave this run its own token registry, so the tokens its agents add are not shared with other runs
             app_config.network_info,
             agents,
             AutoTxConfig(
@@ -180,31 +203,38 @@ def run_task(prompt: str, task: models.TaskCreate, app: models.App, app_user: mo
         )
 
         async def run_task() -> None:
+            sink.start()
             try: 
-                log("execution", "run-start", task_id, tasks)
+                await tasks.a_set_running(task_id)
+                log("execution", "run-start", sink, events)
                 await autotx.a_run(prompt, non_interactive=True)
-                log("execution", "run-end", task_id, tasks)
+                log("execution", "run-end", sink, events)
             except Exception as e:
                 error = traceback.format_exc()
-                db.add_task_error(f"AutoTx run", app.id, app_user.id, task_id, error)
-                stop_task_for_error(tasks, task_id, error, f"An error caused AutoTx to stop ({task_id})")
+                # Persist everything the run produced before the task is marked as stopped
+                await asyncio.to_thread(sink.close)
+                await db.a_add_task_error(f"AutoTx run", app.id, app_user.id, task_id, error)
+                await asyncio.to_thread(stop_with_error, error)
                 raise e
-            tasks.stop(task_id)
-            log("execution", "task-stop", task_id, tasks)
+            log("execution", "task-stop", sink, events)
+            await asyncio.to_thread(sink.close)
+            await tasks.a_stop(task_id)
+            events.close()
 
-        background_tasks.add_task(run_task)
+        background_tasks.add_task(task_scheduler.a_run, scheduled, run_task)
 
-        return created_task
+        return with_queue_position(created_task)
     except Exception as e:
+        sink.close()
         error = traceback.format_exc()
         db.add_task_error(f"Route: create_task", app.id, app_user.id, task_id, error)
-        stop_task_for_error(tasks, task_id, error, f"An error caused AutoTx to stop ({task_id})")
+        stop_with_error(error)
         raise e
 
 @app_router.post("/api/v1/tasks", response_model=models.Task)
 async def create_task(task: models.TaskCreate, background_tasks: BackgroundTasks, authorization: Annotated[str | None, Header()] = None) -> models.Task:   
-    app = authorize(authorization)
-    app_user = db.get_app_user(app.id, task.user_id)
+    app = await a_authorize(authorization)
+    app_user = await db.a_get_app_user(app.id, task.user_id)
     if not app_user:
         raise HTTPException(status_code=400, detail="User not found")
 
@@ -215,8 +245,14 @@ async def create_task(task: models.TaskCreate, background_tasks: BackgroundTasks
         raise HTTPException(status_code=400, detail="Address and Chain ID are required for non-dev mode")
     
     prompt = task.prompt
-    
-    created_task = run_task(prompt, task, app, app_user, tasks, background_tasks)
+
+    scheduled = enqueue_task(app.id)
+
+    try:
+        created_task = await asyncio.to_thread(run_task, prompt, task, app, app_user, tasks, background_tasks, scheduled)
+    except Exception as e:
+        task_scheduler.cancel(scheduled)
+        raise e
 
     return created_task
 
@@ -232,7 +268,7 @@ def provide_feedback(task_id: str, model: FeedbackParams, background_tasks: Back
     
     task = get_task_or_404(task_id, tasks)
 
-    if task.running:
+    if task.running or task.queued:
         raise HTTPException(status_code=400, detail="Task is still running")
     
     global autotx_params
@@ -240,7 +276,7 @@ def provide_feedback(task_id: str, model: FeedbackParams, background_tasks: Back
         raise HTTPException(status_code=400, detail="Address and Chain ID are required for non-dev mode")
     
     # Get all previous tasks
-    previous_tasks = get_previous_tasks(task, tasks)
+    previous_tasks = tasks.get_history(task.id)
 
     prompt = "History:\n"
     for previous_task in previous_tasks[::-1]:
@@ -254,18 +290,24 @@ def provide_feedback(task_id: str, model: FeedbackParams, background_tasks: Back
             prompt += "The user then said:\n" + previous_task.feedback + "\n\n"
 
     prompt += "Now the user provided feedback:\n" + model.feedback
-    
-    tasks.update_feedback(task_id, model.feedback)
 
-    created_task = run_task(prompt, models.TaskCreate(prompt=prompt, address=task.address, chain_id=task.chain_id, user_id=app_user.user_id), app, app_user, tasks, background_tasks, task_id)
+    scheduled = enqueue_task(app.id)
+
+    try:
+        tasks.update_feedback(task_id, model.feedback)
+
+        created_task = run_task(prompt, models.TaskCreate(prompt=prompt, address=task.address, chain_id=task.chain_id, user_id=app_user.user_id), app, app_user, tasks, background_tasks, scheduled, task_id)
+    except Exception as e:
+        task_scheduler.cancel(scheduled)
+        raise e
 
     return created_task
 
 @app_router.post("/api/v1/connect", response_model=models.AppUser)
 async def connect(model: models.ConnectionCreate, authorization: Annotated[str | None, Header()] = None) -> models.AppUser:
-    app = authorize(authorization)
+    app = await a_authorize(authorization)
 
-    app_user = db.get_app_user(app.id, model.user_id)
+    app_user = await db.a_get_app_user(app.id, model.user_id)
 
     if app_user:
         return app_user
@@ -274,17 +316,40 @@ async def connect(model: models.ConnectionCreate, authorization: Annotated[str |
         agent_private_key: str = agent_acc.key.hex()
         agent_address: str = agent_acc.address
 
-        app_user = db.create_app_user(app.id, model.user_id, agent_address, agent_private_key)
+        app_user = await db.a_create_app_user(app.id, model.user_id, agent_address, agent_private_key)
 
         return app_user
 
 @app_router.get("/api/v1/tasks", response_model=List[models.Task])
-def get_tasks(authorization: Annotated[str | None, Header()] = None) -> List['models.Task']:
+def get_tasks(
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_messages: bool | None = None,
+    include_logs: bool | None = None,
+    authorization: Annotated[str | None, Header()] = None
+) -> List['models.Task']:
     app = authorize(authorization)
     tasks = db.TasksRepository(app.id)
+
+    # Without limit and cursor every task is returned with its messages and logs, as before pagination was added
+    paginated = limit is not None or cursor is not None
+    if paginated and limit is None:
+        limit = db.TASKS_PAGE_DEFAULT_LIMIT
+    if include_messages is None:
+        include_messages = not paginated
+    if include_logs is None:
+        include_logs = not paginated
    
-    all_tasks: list[models.Task] = tasks.get_all()
-    return all_tasks
+    try:
+        page = tasks.get_all(limit, cursor, include_messages, include_logs)
+    except db.InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+
+    return [with_queue_position(task) for task in page.tasks]
 
 @app_router.get("/api/v1/tasks/{task_id}", response_model=models.Task)
 def get_task(task_id: str, authorization: Annotated[str | None, Header()] = None) -> 'models.Task':
@@ -292,14 +357,60 @@ def get_task(task_id: str, authorization: Annotated[str | None, Header()] = None
     tasks = db.TasksRepository(app.id)
 
     task = get_task_or_404(task_id, tasks)
-    return task
+    return with_queue_position(task)
+
+@app_router.get("/api/v1/tasks/{task_id}/events")
+async def get_task_events(
+    task_id: str,
+    authorization: Annotated[str | None, Header()] = None,
+    last_event_id: Annotated[str | None, Header()] = None,
+) -> StreamingResponse:
+    app = await a_authorize(authorization)
+
+    try:
+        resume_after = task_events.EventPosition.parse(last_event_id) if last_event_id else task_events.EventPosition()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+
+    stream = task_events.get_stream(task_id, app.id)
+
+    if stream is None:
+        # The task is not running in this process, so replay what was persisted (and poll for more if it runs elsewhere)
+        tasks = db.TasksRepository(app.id)
+        await a_get_task_or_404(task_id, tasks)
+        events = task_events.poll_task_events(lambda: tasks.a_get(task_id), resume_after)
+    else:
+        events = stream.subscribe(resume_after)
+
+    async def follow() -> AsyncIterator[str]:
+        async for event in events:
+            yield event.format() if event else ": keep-alive\n\n"
+
+    return StreamingResponse(
+        follow(),
+        media_type="text/event-stream",
+        headers={ "Cache-Control": "no-cache", "X-Accel-Buffering": "no" },
+    )
 
 @app_router.get("/api/v1/tasks/user/{user_id}")
 def get_user_tasks(
-    user_id: str, authorization: Annotated[str | None, Header()] = None
-) -> dict[str, list[Any]]:
+    user_id: str,
+    limit: int | None = None,
+    cursor: str | None = None,
+    authorization: Annotated[str | None, Header()] = None
+) -> dict[str, Any]:
     (app, app_user) = authorize_app_and_user(authorization, user_id)
-    tasks = db.TasksRepository(app_id=app.id).get_from_user(app_user.id)
+
+    # Without limit and cursor every task of the user is returned, as before pagination was added
+    if cursor is not None and limit is None:
+        limit = db.TASKS_PAGE_DEFAULT_LIMIT
+
+    try:
+        page = db.TasksRepository(app_id=app.id).get_from_user(app_user.id, limit, cursor)
+    except db.InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    tasks = page.tasks
     user_tasks = [
         {
             "id": task.id,
@@ -314,7 +425,7 @@ def get_user_tasks(
         batch for batch in db.get_submitted_transactions_from_user(app.id, app_user.id)
     ]
 
-    return { "tasks": user_tasks, "submitted_transactions": user_submitted_transactions }
+    return { "tasks": user_tasks, "submitted_transactions": user_submitted_transactions, "next_cursor": page.next_cursor }
 
 
 @app_router.get("/api/v1/tasks/{task_id}/intents", response_model=List[Intent])
@@ -333,11 +444,11 @@ async def get_transactions(
     user_id: str, 
     authorization: Annotated[str | None, Header()] = None
 ) -> List[Transaction]:
-    (app, app_user) = authorize_app_and_user(authorization, user_id)
+    (app, app_user) = await a_authorize_app_and_user(authorization, user_id)
 
     tasks = db.TasksRepository(app.id)
     
-    task = get_task_or_404(task_id, tasks)
+    task = await a_get_task_or_404(task_id, tasks)
 
     try:
         if task.chain_id != chain_id:
@@ -345,7 +456,7 @@ async def get_transactions(
 
         transactions = await build_transactions(app.id, user_id, chain_id, address, task)
     except Exception as e:
-        db.add_task_error(f"Route: get_transactions", app.id, app_user.id, task_id, traceback.format_exc())
+        await db.a_add_task_error(f"Route: get_transactions", app.id, app_user.id, task_id, traceback.format_exc())
         raise e
 
     return transactions
@@ -362,11 +473,11 @@ async def prepare_transactions(
     user_id: str, 
     authorization: Annotated[str | None, Header()] = None
 ) -> PreparedTransactionsDto:
-    (app, app_user) = authorize_app_and_user(authorization, user_id)
+    (app, app_user) = await a_authorize_app_and_user(authorization, user_id)
 
     tasks = db.TasksRepository(app.id)
     
-    task = get_task_or_404(task_id, tasks)
+    task = await a_get_task_or_404(task_id, tasks)
 
     try:
         if task.chain_id != chain_id:
@@ -377,9 +488,9 @@ async def prepare_transactions(
         if len(transactions) == 0:
             raise HTTPException(status_code=400, detail="No transactions to send")
 
-        submitted_batch_id = db.save_transactions(app.id, address, chain_id, app_user.id, task_id, transactions)
+        submitted_batch_id = await db.a_save_transactions(app.id, address, chain_id, app_user.id, task_id, transactions)
     except Exception as e:
-        db.add_task_error(f"Route: prepare_transactions", app.id, app_user.id, task_id, traceback.format_exc())
+        await db.a_add_task_error(f"Route: prepare_transactions", app.id, app_user.id, task_id, traceback.format_exc())
         raise e
 
     return PreparedTransactionsDto(batch_id=submitted_batch_id, transactions=transactions)
@@ -393,17 +504,17 @@ async def send_transactions(
     batch_id: str,
     authorization: Annotated[str | None, Header()] = None
 ) -> str:
-    (app, app_user) = authorize_app_and_user(authorization, user_id)
+    (app, app_user) = await a_authorize_app_and_user(authorization, user_id)
 
     tasks = db.TasksRepository(app.id)
     
-    task = get_task_or_404(task_id, tasks)
+    task = await a_get_task_or_404(task_id, tasks)
 
     if task.chain_id != chain_id:
         raise HTTPException(status_code=400, detail="Chain ID does not match task")
 
     try:
-        batch = db.get_transactions(app.id, app_user.id, task_id, address, chain_id, batch_id)
+        batch = await db.a_get_transactions(app.id, app_user.id, task_id, address, chain_id, batch_id)
 
         if batch is None:
             raise HTTPException(status_code=400, detail="Batch not found")
@@ -416,12 +527,12 @@ async def send_transactions(
         global autotx_params
         if autotx_params.is_dev:
             print("Dev mode: skipping transaction submission")
-            db.submit_transactions(app.id, app_user.id, batch_id)
+            await db.a_submit_transactions(app.id, app_user.id, batch_id)
             return f"https://app.safe.global/transactions/queue?safe={CHAIN_ID_TO_SHORT_NAME[str(chain_id)]}:{address}"
 
         try:
-            app_config = AppConfig(subsidized_chain_id=chain_id)
-            wallet = load_wallet_for_user(app_config, app.id, user_id, address)
+            app_config = await app_configs.a_get(chain_id)
+            wallet = await load_wallet_for_user(app_config, app.id, user_id, address)
 
             await wallet.send_transactions(transactions)
         except SafeAPIException as e:
@@ -430,12 +541,12 @@ async def send_transactions(
             else:
                 raise e
             
-        db.submit_transactions(app.id, app_user.id, batch_id)
+        await db.a_submit_transactions(app.id, app_user.id, batch_id)
     except Exception as e:
-        db.add_task_error(f"Route: send_transactions", app.id, app_user.id, task_id, traceback.format_exc())
+        await db.a_add_task_error(f"Route: send_transactions", app.id, app_user.id, task_id, traceback.format_exc())
         raise e
         
-    db.submit_transactions(app.id, app_user.id, batch_id)
+    await db.a_submit_transactions(app.id, app_user.id, batch_id)
 
     return f"https://app.safe.global/transactions/queue?safe={CHAIN_ID_TO_SHORT_NAME[str(chain_id)]}:{address}"
 
@@ -480,10 +591,34 @@ def get_task_logs_formatted(task_id: str, log_type: str) -> str:
 async def get_version() -> Dict[str, str]:
     return {"version": "0.1.0"}
 
+@app_router.get("/api/v1/metrics", response_class=JSONResponse)
+async def get_metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        "db_client_pool": db.client_pool.stats(),
+        "app_cache": db.app_cache.stats(),
+        "app_user_cache": db.app_user_cache.stats(),
+        "task_scheduler": task_scheduler.stats(),
+        "task_log_sink": task_log_sink.stats(),
+        "app_configs": app_configs.stats(),
+        "token_metadata": token_metadata.stats(),
+        "swap_quote_cache": quote_cache.stats(),
+        "lifi": Lifi.stats(),
+        "coingecko": coingecko.stats(),
+        "coingecko_coin_list": coin_list.stats(),
+        "coingecko_responses": coingecko_responses.stats(),
+    }
+
 app = FastAPI()
 
 app.include_router(app_router)
 
+async def close_shared_clients() -> None:
+    await Lifi.close()
+    app_configs.close()
+
+app.add_event_handler("startup", warm_symbol_search_index)
+app.add_event_handler("shutdown", close_shared_clients)
+
 origins = ["*"]
 
 app.add_middleware(
@@ -494,12 +629,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def setup_server(verbose: bool, logs: str | None, max_rounds: int | None, cache: bool, is_dev: bool, check_valid_safe: bool) -> None:
+def setup_server(
+    verbose: bool,
+    logs: str | None,
+    max_rounds: int | None,
+    cache: bool,
+    is_dev: bool,
+    check_valid_safe: bool,
+    max_concurrent_tasks: int = MAX_CONCURRENT_TASKS,
+    max_queued_tasks: int = MAX_QUEUED_TASKS,
+) -> None:
     if is_dev: 
-        app_config = AppConfig() 
+        app_config = app_configs.get()
         # Loading the SafeSmartAccount will deploy a new Safe if one is not already deployed
         SafeSmartAccount(app_config.rpc_url, app_config.network_info, fill_dev_account=True, check_valid_safe=check_valid_safe)
 
+    task_scheduler.configure(max_concurrent_tasks, max_queued_tasks)
+
     global autotx_params
     autotx_params = AutoTxParams(
         verbose=verbose, 
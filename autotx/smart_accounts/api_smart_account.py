@@ -1,3 +1,4 @@
+from typing import Callable
 from web3 import Web3
 from autotx import db
 from autotx.intents import Intent
@@ -9,12 +10,21 @@ class ApiSmartAccount(SmartAccount):
     wallet: SmartAccount
     tasks: db.TasksRepository
     task_id: str | None
+    on_intents_saved: Callable[[list[Intent]], None] | None
 
-    def __init__(self, web3: Web3, wallet: SmartAccount, tasks: db.TasksRepository, task_id: str | None = None):
+    def __init__(
+        self,
+        web3: Web3,
+        wallet: SmartAccount,
+        tasks: db.TasksRepository,
+        task_id: str | None = None,
+        on_intents_saved: Callable[[list[Intent]], None] | None = None,
+    ):
         super().__init__(web3, wallet.address)
         self.wallet = wallet
         self.tasks = tasks
         self.task_id = task_id
+        self.on_intents_saved = on_intents_saved
 
     def on_intents_prepared(self, intents: list[Intent]) -> None:
         if self.task_id is None:
@@ -27,6 +37,9 @@ class ApiSmartAccount(SmartAccount):
         saved_task.intents.extend(intents)
         self.tasks.update(saved_task)
 
+        if self.on_intents_saved:
+            self.on_intents_saved(intents)
+
     async def on_intents_ready(self, _intents: list[Intent]) -> bool | str:
         return True
     
@@ -0,0 +1,228 @@
+import asyncio
+from dataclasses import dataclass, replace
+import json
+import threading
+import time
+from typing import AsyncIterator, Awaitable, Callable
+
+from autotx import models
+from autotx.intents import Intent
+
+KEEP_ALIVE_INTERVAL_SEC = 15
+# How long the events of a finished task stay in memory for clients to catch up
+FINISHED_STREAM_RETENTION_SEC = 600
+# How often a task running in another process is re-read from the database
+PERSISTED_TASK_POLL_INTERVAL_SEC = 2
+
+# Position of an event in the task, as the number of messages, intents and logs of the task up to and including it.
+# Events are identified by their position rather than by their index in the stream, so that the same ids can be
+# rebuilt from the database (where messages, intents and logs are stored separately) after the stream is gone.
+@dataclass(frozen=True)
+class EventPosition:
+    messages: int = 0
+    intents: int = 0
+    logs: int = 0
+
+    @classmethod
+    def parse(cls, event_id: str) -> "EventPosition":
+        # Raises ValueError for ids not returned by format
+        (messages, intents, logs) = (int(count) for count in event_id.split("-"))
+        if min(messages, intents, logs) < 0:
+            raise ValueError(f"Invalid event id: {event_id}")
+        return cls(messages, intents, logs)
+
+    def format(self) -> str:
+        return f"{self.messages}-{self.intents}-{self.logs}"
+
+@dataclass
+class TaskEvent:
+    position: EventPosition
+    type: str
+    data: str
+
+    @property
+    def id(self) -> str:
+        return self.position.format()
+
+    def is_after(self, position: EventPosition) -> bool:
+        # Whether a client that received the events up to position has not received this one yet
+        if self.type == "message":
+            return self.position.messages > position.messages
+        if self.type == "intents":
+            return self.position.intents > position.intents
+        if self.type == "log":
+            return self.position.logs > position.logs
+        return True
+
+    def format(self) -> str:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.data}\n\n"
+
+def format_message(message: str) -> str:
+    return json.dumps(message)
+
+def format_log(log: models.TaskLog) -> str:
+    return log.model_dump_json()
+
+def format_intents(intents: list[Intent]) -> str:
+    return json.dumps([intent.model_dump(mode="json") for intent in intents])
+
+def format_state(running: bool, error: str | None) -> str:
+    return json.dumps({ "running": running, "error": error })
+
+# In-memory, append-only stream of the events of a running task.
+# Events can be published from any thread, subscribers are async iterators that resume after a given event id.
+class TaskEventStream:
+    task_id: str
+    app_id: str
+    events: list[TaskEvent]
+    closed_at: float | None
+
+    def __init__(self, task_id: str, app_id: str):
+        self.task_id = task_id
+        self.app_id = app_id
+        self.events = []
+        self.closed_at = None
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    def publish_message(self, message: str) -> None:
+        self._publish("message", format_message(message), lambda position: replace(position, messages=position.messages + 1))
+
+    def publish_log(self, log: models.TaskLog) -> None:
+        self._publish("log", format_log(log), lambda position: replace(position, logs=position.logs + 1))
+
+    def publish_intents(self, intents: list[Intent]) -> None:
+        # Only the newly prepared intents are sent, the position counts all the intents of the task
+        self._publish("intents", format_intents(intents), lambda position: replace(position, intents=position.intents + len(intents)))
+
+    def close(self, error: str | None = None) -> None:
+        self._publish("state", format_state(False, error), lambda position: position)
+        with self._lock:
+            self.closed_at = time.monotonic()
+        self._notify()
+
+    def _publish(self, event_type: str, data: str, advance: Callable[[EventPosition], EventPosition]) -> None:
+        with self._lock:
+            if self.closed_at is not None:
+                return
+            position = advance(self.events[-1].position if self.events else EventPosition())
+            self.events.append(TaskEvent(position, event_type, data))
+        self._notify()
+
+    async def subscribe(self, after: EventPosition = EventPosition()) -> AsyncIterator[TaskEvent | None]:
+        # Yields the events after the given position, then None when no event was published for KEEP_ALIVE_INTERVAL_SEC
+        loop = asyncio.get_running_loop()
+        waiter = (loop, asyncio.Event())
+        next_index = 0
+
+        with self._lock:
+            self._waiters.add(waiter)
+
+        try:
+            while True:
+                waiter[1].clear()
+
+                with self._lock:
+                    new_events = self.events[next_index:]
+                    next_index = len(self.events)
+                    closed = self.closed_at is not None
+
+                for event in new_events:
+                    if event.is_after(after):
+                        yield event
+
+                if closed:
+                    return
+
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), KEEP_ALIVE_INTERVAL_SEC)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def _notify(self) -> None:
+        with self._lock:
+            waiters = list(self._waiters)
+
+        for (loop, event) in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+streams: dict[str, TaskEventStream] = {}
+streams_lock = threading.Lock()
+
+def create_stream(task_id: str, app_id: str) -> TaskEventStream:
+    stream = TaskEventStream(task_id, app_id)
+
+    with streams_lock:
+        now = time.monotonic()
+        for expired_task_id in [
+            id for id, existing in streams.items()
+            if existing.closed_at is not None and now - existing.closed_at > FINISHED_STREAM_RETENTION_SEC
+        ]:
+            del streams[expired_task_id]
+
+        streams[task_id] = stream
+
+    return stream
+
+def get_stream(task_id: str, app_id: str) -> TaskEventStream | None:
+    with streams_lock:
+        stream = streams.get(task_id)
+
+    if stream is None or stream.app_id != app_id:
+        return None
+
+    return stream
+
+def replay_task_events(task: models.Task, after: EventPosition = EventPosition()) -> list[TaskEvent]:
+    # Rebuilds the events after the given position from what was persisted, for tasks whose stream is not
+    # in memory (e.g. after a restart or when the task runs in another process). Messages, intents and logs
+    # are replayed in that order rather than interleaved, with the same ids as the live stream gave them.
+    # The final state event is only included once the task finished.
+    events: list[TaskEvent] = []
+    position = after
+
+    for message in (task.messages or [])[after.messages:]:
+        position = replace(position, messages=position.messages + 1)
+        events.append(TaskEvent(position, "message", format_message(message)))
+    if len(task.intents) > after.intents:
+        position = replace(position, intents=len(task.intents))
+        events.append(TaskEvent(position, "intents", format_intents(task.intents[after.intents:])))
+    for log in (task.logs or [])[after.logs:]:
+        position = replace(position, logs=position.logs + 1)
+        events.append(TaskEvent(position, "log", format_log(log)))
+
+    if not task.running and not task.queued:
+        events.append(TaskEvent(position, "state", format_state(False, task.error)))
+
+    return events
+
+async def poll_task_events(
+    get_task: Callable[[], Awaitable[models.Task | None]],
+    after: EventPosition = EventPosition(),
+) -> AsyncIterator[TaskEvent | None]:
+    # Replays a task from the database and keeps re-reading it while it is queued or running in another process,
+    # yields None when nothing new was persisted for KEEP_ALIVE_INTERVAL_SEC
+    last_event_at = time.monotonic()
+
+    while True:
+        task = await get_task()
+        if task is None:
+            return
+
+        events = replay_task_events(task, after)
+        for event in events:
+            after = event.position
+            yield event
+        if not task.running and not task.queued:
+            return
+
+        if events:
+            last_event_at = time.monotonic()
+        elif time.monotonic() - last_event_at >= KEEP_ALIVE_INTERVAL_SEC:
+            last_event_at = time.monotonic()
+            yield None
+
+        await asyncio.sleep(PERSISTED_TASK_POLL_INTERVAL_SEC)
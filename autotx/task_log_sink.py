@@ -0,0 +1,179 @@
+import threading
+import time
+import traceback
+from typing import Any, Callable
+
+from autotx import db, models
+
+FLUSH_INTERVAL_MS = 500
+MAX_BATCH_SIZE = 50
+MAX_PENDING = 5000
+# A batch that keeps failing is retried this many times, waiting a little longer each time, before it is dropped
+MAX_WRITE_ATTEMPTS = 5
+RETRY_DELAY_MS = 500
+
+# Totals across every sink of the process, reported by the metrics endpoint
+_totals = { "writes": 0, "failed_writes": 0, "dropped_entries": 0, "active_sinks": 0 }
+_totals_lock = threading.Lock()
+
+def _add_to_totals(counter: str, value: int = 1) -> None:
+    with _totals_lock:
+        _totals[counter] += value
+
+def stats() -> dict[str, int]:
+    with _totals_lock:
+        return dict(_totals)
+
+# Buffers the messages and logs of a running task and writes them to the database in batches
+# from a background thread (started with start), so the agents never wait on a database round trip.
+# Batches that fail to be written are put back in front of the buffer and retried.
+class TaskLogSink:
+    tasks: db.TasksRepository
+    task_id: str
+    flush_interval_ms: int
+    max_batch_size: int
+    max_pending: int
+    max_write_attempts: int
+    retry_delay_ms: int
+    writes: int
+    failed_writes: int
+    dropped_entries: int
+
+    def __init__(
+        self,
+        tasks: db.TasksRepository,
+        task_id: str,
+        flush_interval_ms: int = FLUSH_INTERVAL_MS,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_pending: int = MAX_PENDING,
+        max_write_attempts: int = MAX_WRITE_ATTEMPTS,
+        retry_delay_ms: int = RETRY_DELAY_MS,
+    ):
+        self.tasks = tasks
+        self.task_id = task_id
+        self.flush_interval_ms = flush_interval_ms
+        self.max_batch_size = max_batch_size
+        self.max_pending = max_pending
+        self.max_write_attempts = max_write_attempts
+        self.retry_delay_ms = retry_delay_ms
+        self.writes = 0
+        self.failed_writes = 0
+        self.dropped_entries = 0
+
+        self._messages: list[str] = []
+        self._logs: list[models.TaskLog] = []
+        self._message_attempts = 0
+        self._log_attempts = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"task-log-sink-{task_id}", daemon=True)
+        self._started = False
+
+    def add_message(self, message: str) -> None:
+        self._add(lambda: self._messages.append(message))
+
+    def add_log(self, log: models.TaskLog) -> None:
+        self._add(lambda: self._logs.append(log))
+
+    def start(self) -> None:
+        # Called when the task starts running, entries added before are written with the first batch
+        with self._condition:
+            if self._started:
+                return
+            self._started = True
+            _add_to_totals("active_sinks")
+        self._thread.start()
+
+    def close(self) -> None:
+        # Writes everything still buffered, then stops the writer thread
+        self.start()
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        _add_to_totals("active_sinks", -1)
+
+    def _add(self, append: Callable[[], None]) -> None:
+        with self._condition:
+            if self._closed:
+                raise Exception(f"Log sink for task {self.task_id} is closed")
+            # Only block the caller if the database has fallen far behind
+            while self._pending() >= self.max_pending and self._thread.is_alive():
+                self._condition.wait()
+            append()
+            if self._pending() >= self.max_batch_size:
+                self._condition.notify_all()
+
+    def _pending(self) -> int:
+        return len(self._messages) + len(self._logs)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.flush_interval_ms / 1000
+                while not self._closed and self._pending() < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                messages, self._messages = self._messages, []
+                logs, self._logs = self._logs, []
+
+            failed = False
+            if messages and not self._write_messages(messages):
+                failed = True
+            if logs and not self._write_logs(logs):
+                failed = True
+
+            with self._condition:
+                self._condition.notify_all()
+                if failed:
+                    # Back off before retrying, the batches were put back in front of the buffer
+                    attempts = max(self._message_attempts, self._log_attempts)
+                    self._condition.wait(self.retry_delay_ms / 1000 * attempts)
+                elif self._closed and self._pending() == 0:
+                    return
+
+    def _write_messages(self, messages: list[str]) -> bool:
+        try:
+            self.tasks.add_messages(self.task_id, messages)
+        except Exception:
+            self._message_attempts = self._on_failed_write("messages", messages, self._messages, self._message_attempts)
+            return False
+        self._message_attempts = 0
+        self._on_write()
+        return True
+
+    def _write_logs(self, logs: list[models.TaskLog]) -> bool:
+        try:
+            self.tasks.add_logs(self.task_id, logs)
+        except Exception:
+            self._log_attempts = self._on_failed_write("logs", logs, self._logs, self._log_attempts)
+            return False
+        self._log_attempts = 0
+        self._on_write()
+        return True
+
+    def _on_write(self) -> None:
+        self.writes += 1
+        _add_to_totals("writes")
+
+    def _on_failed_write(self, kind: str, batch: list[Any], buffer: list[Any], attempts: int) -> int:
+        # Returns the number of attempts made for the entries now at the front of the buffer
+        attempts += 1
+        self.failed_writes += 1
+        _add_to_totals("failed_writes")
+        print(f"Failed to write {len(batch)} {kind} for task {self.task_id} (attempt {attempts}):\n{traceback.format_exc()}")
+
+        if attempts >= self.max_write_attempts:
+            self.dropped_entries += len(batch)
+            _add_to_totals("dropped_entries", len(batch))
+            print(f"Dropped {len(batch)} {kind} for task {self.task_id} after {attempts} attempts")
+            return 0
+
+        with self._condition:
+            buffer[:0] = batch
+        return attempts
@@ -0,0 +1,184 @@
+import asyncio
+from collections import OrderedDict, deque
+import threading
+import time
+from typing import Awaitable, Callable
+
+MAX_CONCURRENT_TASKS = 4
+MAX_QUEUED_TASKS = 100
+# A task whose run did not start this long after it was enqueued (e.g. its background task was never run
+# because the client disconnected) is removed from the queue
+MAX_START_DELAY_SEC = 60
+
+class TaskQueueFull(Exception):
+    pass
+
+class ScheduledTask:
+    app_id: str
+    task_id: str | None
+    dispatched: bool
+    enqueued_at: float
+
+    def __init__(self, app_id: str):
+        self.app_id = app_id
+        self.task_id = None
+        self.dispatched = False
+        self.enqueued_at = time.monotonic()
+        self._waiter: tuple[asyncio.AbstractEventLoop, asyncio.Event] | None = None
+
+# Limits how many tasks run at once. Waiting tasks are kept in a FIFO queue per app
+# and the apps take turns, so a burst of prompts from one app does not starve the others.
+# A task only takes a slot once its run has started (a_run), so a run that never starts cannot hold one.
+class TaskScheduler:
+    max_concurrent: int
+    max_queued: int
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_TASKS, max_queued: int = MAX_QUEUED_TASKS):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._queues: OrderedDict[str, deque[ScheduledTask]] = OrderedDict()
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def configure(self, max_concurrent: int, max_queued: int) -> None:
+        with self._lock:
+            self.max_concurrent = max_concurrent
+            self.max_queued = max_queued
+        self._dispatch()
+
+    def enqueue(self, app_id: str) -> ScheduledTask:
+        scheduled = ScheduledTask(app_id)
+
+        with self._lock:
+            self._drop_not_started()
+            if self._queued_count() - self._free_slots() >= self.max_queued:
+                raise TaskQueueFull(f"Task queue is full ({self.max_queued} tasks waiting)")
+
+            self._queues.setdefault(app_id, deque()).append(scheduled)
+
+        self._dispatch()
+
+        return scheduled
+
+    def cancel(self, scheduled: ScheduledTask) -> None:
+        with self._lock:
+            if scheduled.dispatched:
+                self._running -= 1
+            else:
+                queue = self._queues.get(scheduled.app_id)
+                if queue is not None and scheduled in queue:
+                    queue.remove(scheduled)
+                    if not queue:
+                        del self._queues[scheduled.app_id]
+
+        self._dispatch()
+
+    async def a_run(self, scheduled: ScheduledTask, run: Callable[[], Awaitable[None]]) -> None:
+        event = asyncio.Event()
+
+        with self._lock:
+            queue = self._queues.setdefault(scheduled.app_id, deque())
+            if scheduled not in queue:
+                # Dropped because it took too long to start, it goes to the back of the line
+                queue.append(scheduled)
+            scheduled._waiter = (asyncio.get_running_loop(), event)
+
+        self._dispatch()
+
+        try:
+            await event.wait()
+        except BaseException:
+            self.cancel(scheduled)
+            raise
+
+        try:
+            await run()
+        finally:
+            with self._lock:
+                self._running -= 1
+            self._dispatch()
+
+    def position(self, task_id: str) -> int | None:
+        # 1 means the task is the next one to start, None that it is not waiting
+        with self._lock:
+            # The first tasks in line take the free slots as soon as their run starts
+            for position, scheduled in enumerate(self._dispatch_order(), start=1 - self._free_slots()):
+                if scheduled.task_id == task_id:
+                    return position if position > 0 else None
+
+        return None
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "running": self._running,
+                "queued": self._queued_count(),
+                "max_concurrent": self.max_concurrent,
+                "max_queued": self.max_queued,
+            }
+
+    def _free_slots(self) -> int:
+        return max(0, self.max_concurrent - self._running)
+
+    def _queued_count(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _dispatch_order(self) -> list[ScheduledTask]:
+        # Round robin over the apps, in the order they will be served
+        queues = [list(queue) for queue in self._queues.values()]
+        order: list[ScheduledTask] = []
+
+        for turn in range(max((len(queue) for queue in queues), default=0)):
+            order.extend(queue[turn] for queue in queues if turn < len(queue))
+
+        return order
+
+    def _next_started(self) -> ScheduledTask | None:
+        # The oldest task of the first app in line whose run has started
+        for app_id, queue in self._queues.items():
+            scheduled = next((scheduled for scheduled in queue if scheduled._waiter is not None), None)
+            if scheduled is None:
+                continue
+
+            queue.remove(scheduled)
+            # The app goes to the back of the line for its next task
+            del self._queues[app_id]
+            if queue:
+                self._queues[app_id] = queue
+
+            return scheduled
+
+        return None
+
+    def _drop_not_started(self) -> None:
+        now = time.monotonic()
+        for app_id, queue in list(self._queues.items()):
+            for scheduled in [
+                scheduled for scheduled in queue
+                if scheduled._waiter is None and now - scheduled.enqueued_at > MAX_START_DELAY_SEC
+            ]:
+                queue.remove(scheduled)
+            if not queue:
+                del self._queues[app_id]
+
+    def _dispatch(self) -> None:
+        waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+        with self._lock:
+            self._drop_not_started()
+
+            while self._running < self.max_concurrent:
+                scheduled = self._next_started()
+                if scheduled is None:
+                    break
+
+                scheduled.dispatched = True
+                self._running += 1
+
+                if scheduled._waiter is not None:
+                    waiters.append(scheduled._waiter)
+
+        for (loop, event) in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+task_scheduler = TaskScheduler()
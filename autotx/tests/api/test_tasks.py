@@ -1,3 +1,4 @@
+import json
 import uuid
 from fastapi.testclient import TestClient
 import pytest
@@ -62,7 +63,8 @@ def test_create_task():
     assert "updated_at" in data
     assert data["messages"] == []
     assert data["intents"] == []
-    assert data["running"] is True
+    assert data["running"] is False
+    assert data["queued"] is True
 
     response = client.get(f"/api/v1/tasks/{data['id']}", headers={
         "Authorization": f"Bearer 1234"
@@ -70,6 +72,7 @@ def test_create_task():
     data = response.json()
 
     assert data["running"] is False
+    assert data["queued"] is False
     assert len(data["intents"]) > 0
 
 def test_get_tasks():
@@ -108,3 +111,79 @@ def test_get_task_intents():
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 1
+
+def test_get_task_logs():
+    response = client.get("/api/v1/tasks", headers={
+        "Authorization": f"Bearer 1234"
+    })
+    task_id = response.json()[0]["id"]
+
+    response = client.get(f"/api/v1/tasks/{task_id}/logs")
+    assert response.status_code == 200
+    data = response.json()
+
+    execution_logs = [json.loads(log["obj"]) for log in data if log["type"] == "execution"]
+    assert execution_logs == ["run-start", "run-end", "task-stop"]
+
+def test_get_tasks_not_paginated():
+    response = client.get("/api/v1/tasks", headers={
+        "Authorization": f"Bearer 1234"
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data[0]["messages"]) > 0
+    assert len(data[0]["logs"]) > 0
+    assert "X-Next-Cursor" not in response.headers
+
+def test_get_tasks_paginated():
+    response = client.get("/api/v1/tasks", params={"limit": 1}, headers={
+        "Authorization": f"Bearer 1234"
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["messages"] is None
+    assert data[0]["logs"] is None
+    assert "X-Next-Cursor" not in response.headers
+
+    response = client.get("/api/v1/tasks", params={"include_messages": True, "include_logs": True}, headers={
+        "Authorization": f"Bearer 1234"
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data[0]["messages"]) > 0
+    assert len(data[0]["logs"]) > 0
+
+    response = client.get("/api/v1/tasks", params={"cursor": "invalid"}, headers={
+        "Authorization": f"Bearer 1234"
+    })
+    assert response.status_code == 400
+
+def test_get_task_events():
+    response = client.get("/api/v1/tasks", headers={
+        "Authorization": f"Bearer 1234"
+    })
+    task_id = response.json()[0]["id"]
+
+    response = client.get(f"/api/v1/tasks/{task_id}/events", headers={
+        "Authorization": f"Bearer 1234"
+    })
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = [
+        dict(line.split(": ", 1) for line in block.split("\n"))
+        for block in response.text.strip().split("\n\n")
+    ]
+    event_types = [event["event"] for event in events]
+    assert "message" in event_types
+    assert "intents" in event_types
+    assert event_types[-1] == "state"
+    assert json.loads(events[-1]["data"]) == { "running": False, "error": None }
+
+    response = client.get(f"/api/v1/tasks/{task_id}/events", headers={
+        "Authorization": f"Bearer 1234",
+        "Last-Event-ID": events[-2]["id"],
+    })
+    assert response.status_code == 200
+    assert response.text == f"id: {events[-1]['id']}\nevent: state\ndata: {events[-1]['data']}\n\n"
@@ -0,0 +1,6 @@
+import pytest
+
+# Unit tests do not need the local chain fork
+@pytest.fixture(autouse=True)
+def start_and_stop_local_fork():
+    yield
@@ -0,0 +1,19 @@
+from web3 import Web3
+
+from autotx.utils.configuration import AppConfig
+from autotx.utils.ethereum.networks import NetworkInfo
+
+def test_copies_share_the_connection_but_not_the_token_registry():
+    shared = AppConfig.__new__(AppConfig)
+    shared.rpc_url = "http://localhost:8545"
+    shared.web3 = Web3()
+    shared.network_info = NetworkInfo(1)
+
+    first = shared.with_own_network_info()
+    second = shared.with_own_network_info()
+    first.network_info.tokens["new-token"] = "0x0000000000000000000000000000000000000001"
+
+    assert first.web3 is second.web3 is shared.web3
+    assert "new-token" not in second.network_info.tokens
+    assert "new-token" not in shared.network_info.tokens
+    assert "usdc" in second.network_info.tokens
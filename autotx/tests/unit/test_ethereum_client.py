@@ -0,0 +1,57 @@
+import threading
+from typing import Any
+
+import pytest
+
+from autotx.utils.ethereum import ethereum_client
+
+SLOW_URL = "http://slow-node:8545"
+FAST_URL = "http://fast-node:8545"
+
+class FakeEthereumClient:
+    def __init__(self, rpc_url: str):
+        self.rpc_url = rpc_url
+        if rpc_url == SLOW_URL:
+            slow_client_started.set()
+            assert release_slow_client.wait(5)
+
+slow_client_started = threading.Event()
+release_slow_client = threading.Event()
+
+@pytest.fixture(autouse=True)
+def fake_clients(monkeypatch: Any):
+    monkeypatch.setattr(ethereum_client, "EthereumClient", FakeEthereumClient)
+    monkeypatch.setattr(ethereum_client, "_clients", {})
+    slow_client_started.clear()
+    release_slow_client.clear()
+
+def test_slow_endpoint_does_not_block_other_lookups():
+    slow_lookup = threading.Thread(target=ethereum_client.get_ethereum_client_for_url, args=(SLOW_URL,))
+    slow_lookup.start()
+    try:
+        assert slow_client_started.wait(5)
+
+        fast_lookup = threading.Thread(target=ethereum_client.get_ethereum_client_for_url, args=(FAST_URL,))
+        fast_lookup.start()
+        fast_lookup.join(1)
+
+        assert not fast_lookup.is_alive()
+    finally:
+        release_slow_client.set()
+        slow_lookup.join(5)
+
+def test_racing_lookups_share_the_first_stored_client():
+    release_slow_client.set()
+    clients = []
+    lookups = [
+        threading.Thread(target=lambda: clients.append(ethereum_client.get_ethereum_client_for_url(FAST_URL)))
+        for _ in range(8)
+    ]
+    for lookup in lookups:
+        lookup.start()
+    for lookup in lookups:
+        lookup.join(5)
+
+    assert len(clients) == 8
+    assert all(client is clients[0] for client in clients)
+    assert ethereum_client.get_ethereum_client_for_url(FAST_URL) is clients[0]
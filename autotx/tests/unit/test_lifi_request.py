@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from autotx.utils.ethereum.lifi import Lifi, LifiRateLimitError
+from autotx.utils.rate_limit import CircuitBreaker, CircuitOpenError, CircuitState, TokenBucket
+
+class HangingRequest:
+    async def __aenter__(self) -> Any:
+        await asyncio.sleep(3600)
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+class HangingSession:
+    def request(self, method: str, url: str, **kwargs: Any) -> HangingRequest:
+        return HangingRequest()
+
+def test_cancelled_trial_call_lets_the_next_one_through(monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_sec=0)
+    breaker.record_failure()
+    monkeypatch.setattr(Lifi, "circuit_breaker", breaker)
+
+    async def get_session() -> HangingSession:
+        return HangingSession()
+
+    monkeypatch.setattr(Lifi, "get_session", get_session)
+
+    async def cancel_trial_call() -> None:
+        request = asyncio.create_task(Lifi.request("GET", "/quote"))
+        await asyncio.sleep(0.01)
+        assert breaker.state == CircuitState.HALF_OPEN
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+
+    asyncio.run(cancel_trial_call())
+
+    # The next call is let through as the trial, instead of being rejected forever
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+class UnusedSession:
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        raise AssertionError("No request should be made")
+
+def test_callers_are_not_kept_waiting_for_a_distant_rate_limit_token(monkeypatch):
+    # One request per hour, already used
+    limiter = TokenBucket(1 / 3600, 1)
+    limiter.reserve()
+    monkeypatch.setattr(Lifi, "get_rate_limiter", classmethod(lambda cls: limiter))
+    monkeypatch.setattr(Lifi, "circuit_breaker", CircuitBreaker("test"))
+
+    async def get_session() -> UnusedSession:
+        return UnusedSession()
+
+    monkeypatch.setattr(Lifi, "get_session", get_session)
+
+    async def request() -> None:
+        with pytest.raises(LifiRateLimitError) as error:
+            await asyncio.wait_for(Lifi.request("GET", "/quote"), 1)
+        assert error.value.retry_after_sec is not None and error.value.retry_after_sec > Lifi.retry_policy.max_retry_after_sec
+
+    asyncio.run(request())
+    asyncio.run(request())
+
+    # The tokens of the rejected callers were given back, so the next one is still an hour away rather than three
+    assert limiter.reserve() == pytest.approx(3600, abs=1)
+    assert limiter.stats()["rejected"] == 2
@@ -0,0 +1,15 @@
+import asyncio
+
+from autotx.utils.ethereum.lifi import Lifi
+
+def test_closes_the_sessions_of_closed_loops():
+    async def get_session():
+        return await Lifi.get_session()
+
+    # The loop is closed without Lifi.close, like asyncio.run instead of Lifi.run
+    abandoned = asyncio.run(get_session())
+    session = Lifi.run(get_session())
+
+    assert session is not abandoned
+    assert abandoned.closed
+    assert session.closed
@@ -0,0 +1,43 @@
+import asyncio
+from decimal import Decimal
+from typing import Any
+
+import pytest
+
+from autotx.eth_address import ETHAddress
+from autotx.utils.ethereum.lifi import swap
+from autotx.utils.ethereum.lifi.swap import QuoteInformation, get_quote
+from autotx.utils.ethereum.networks import ChainId
+from autotx.utils.ttl_cache import TTLCache
+
+WETH_ADDRESS = ETHAddress("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2")
+USDC_ADDRESS = ETHAddress("0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48")
+SENDER_ADDRESS = ETHAddress("0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045")
+
+@pytest.fixture(autouse=True)
+def fresh_quotes(monkeypatch: Any):
+    monkeypatch.setattr(swap, "quote_cache", TTLCache(ttl_sec=60, max_size=10))
+
+    async def fetch_quote(*args: Any) -> QuoteInformation:
+        return QuoteInformation(
+            approval_address=SENDER_ADDRESS.hex,
+            amount_in=1,
+            to_amount_min=1,
+            transaction={ "to": USDC_ADDRESS.hex, "data": "0x", "gas": 21000 },
+            exchange_name="test",
+        )
+
+    monkeypatch.setattr(swap, "fetch_quote", fetch_quote)
+
+def quote() -> QuoteInformation:
+    return asyncio.run(get_quote(WETH_ADDRESS, 18, "WETH", USDC_ADDRESS, 6, "USDC", ChainId.MAINNET, Decimal(1), False, SENDER_ADDRESS))
+
+def test_callers_cannot_change_the_cached_quote():
+    fetched = quote()
+    fetched.transaction["gas"] = 1
+
+    cached = quote()
+    assert cached.transaction["gas"] == 21000
+    cached.transaction["gas"] = 2
+
+    assert quote().transaction["gas"] == 21000
@@ -0,0 +1,78 @@
+import asyncio
+import json
+import time
+from typing import Any
+
+from autotx.agents import ResearchTokensAgent
+from autotx.agents.ResearchTokensAgent import GetAvailableCategoriesTool, SearchTokenTool
+from autotx.utils.coingecko import symbol_index
+from autotx.utils.coingecko.coin_list import CoinListIndex
+from autotx.utils.coingecko.response_cache import CoinGeckoResponseCache
+from autotx.utils.ethereum.networks import NetworkInfo
+
+class FakeAutoTx:
+    def __init__(self) -> None:
+        self.cache_lookups: list[bool] = []
+        self.network = NetworkInfo(1)
+
+    def notify_user(self, message: str, color: Any = None) -> None:
+        pass
+
+    def record_tool_cache_lookup(self, tool_name: str, hit: bool) -> None:
+        self.cache_lookups.append(hit)
+
+class ThrottledCategories:
+    def get_list(self) -> list[dict[str, str]]:
+        # Stands in for a request waiting for the shared rate limiter
+        time.sleep(0.3)
+        return [{ "category_id": "layer-1" }]
+
+class ThrottledCoinGecko:
+    categories = ThrottledCategories()
+
+async def run_while_ticking(tool_call: Any) -> tuple[Any, int]:
+    # Returns the tool's result and how many times the event loop ran another coroutine meanwhile
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    result = await tool_call
+    ticker.cancel()
+    return (result, ticks)
+
+def test_tools_do_not_block_the_event_loop_while_waiting_for_coingecko(monkeypatch):
+    monkeypatch.setattr(ResearchTokensAgent, "coingecko_responses", CoinGeckoResponseCache())
+    monkeypatch.setattr(ResearchTokensAgent, "get_coingecko", lambda: ThrottledCoinGecko())
+    autotx: Any = FakeAutoTx()
+    tool = GetAvailableCategoriesTool().build_tool(autotx)
+
+    (result, ticks) = asyncio.run(run_while_ticking(tool()))
+
+    assert json.loads(result) == ["layer-1"]
+    assert ticks > 10
+    assert autotx.cache_lookups == [False]
+
+def test_first_search_downloads_the_coin_list_off_the_event_loop(monkeypatch, tmp_path):
+    def fetch_coins() -> list[dict[str, Any]]:
+        # Stands in for the download of the whole coin list
+        time.sleep(0.3)
+        return [{ "id": "uniswap", "symbol": "uni", "name": "Uniswap", "platforms": {} }]
+
+    cold_coin_list = CoinListIndex(folder=str(tmp_path), fetch_coins=fetch_coins, fetch_ranks=lambda: {})
+    monkeypatch.setattr(ResearchTokensAgent, "coin_list", cold_coin_list)
+    monkeypatch.setattr(symbol_index, "coin_list", cold_coin_list)
+    monkeypatch.setattr(symbol_index, "_index", None)
+    monkeypatch.setattr(symbol_index, "_index_source", None)
+    autotx: Any = FakeAutoTx()
+    tool = SearchTokenTool().build_tool(autotx)
+
+    (result, ticks) = asyncio.run(run_while_ticking(tool("UNI", False)))
+
+    assert json.loads(result) == "uniswap"
+    assert ticks > 10
+    assert autotx.cache_lookups == [True]
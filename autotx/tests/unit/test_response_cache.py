@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+from autotx.utils.coingecko.response_cache import CoinGeckoResponseCache
+
+def test_identical_requests_are_coalesced_then_cached():
+    cache = CoinGeckoResponseCache()
+    calls = 0
+
+    def fetch() -> list[str]:
+        nonlocal calls
+        calls += 1
+        time.sleep(0.1)
+        return ["layer-1"]
+
+    async def run() -> None:
+        first, second = await asyncio.gather(
+            cache.a_get("categories", "list", fetch),
+            cache.a_get("categories", "list", fetch),
+        )
+        assert first == (["layer-1"], False)
+        assert second == (["layer-1"], True)
+        assert await cache.a_get("categories", "list", fetch) == (["layer-1"], True)
+
+    asyncio.run(run())
+
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 1
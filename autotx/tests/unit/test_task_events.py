@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime
+import json
+
+from autotx import models
+from autotx.intents import BuyIntent
+from autotx.task_events import EventPosition, TaskEventStream, poll_task_events, replay_task_events
+from autotx.token import Token
+
+ETH = Token(symbol="ETH", address="0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE")
+USDC = Token(symbol="USDC", address="0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48")
+
+def create_log(obj: str) -> models.TaskLog:
+    return models.TaskLog(type="execution", obj=json.dumps(obj), created_at=datetime(2024, 7, 10))
+
+def create_task(messages: list[str], intents: list[BuyIntent], logs: list[models.TaskLog], running: bool) -> models.Task:
+    return models.Task(
+        id="task-id",
+        prompt="Buy 1 ETH with USDC",
+        address="0x",
+        chain_id=1,
+        created_at=datetime(2024, 7, 10),
+        updated_at=datetime(2024, 7, 10),
+        error=None,
+        running=running,
+        messages=messages,
+        logs=logs,
+        intents=intents,
+        previous_task_id=None,
+        feedback=None,
+    )
+
+def run_live_task() -> tuple[TaskEventStream, models.Task]:
+    # Publishes interleaved events like a run does, and returns the task as it was persisted
+    intents = [BuyIntent.create(USDC, ETH, 1), BuyIntent.create(USDC, ETH, 2)]
+    logs = [create_log("run-start"), create_log("agent message"), create_log("run-end")]
+
+    stream = TaskEventStream("task-id", "app-id")
+    stream.publish_log(logs[0])
+    stream.publish_message("Looking up ETH")
+    stream.publish_intents(intents[:1])
+    stream.publish_log(logs[1])
+    stream.publish_message("Buying ETH")
+    stream.publish_intents(intents[1:])
+    stream.publish_log(logs[2])
+    stream.close()
+
+    return (stream, create_task(["Looking up ETH", "Buying ETH"], intents, logs, running=False))
+
+async def collect(events) -> list:
+    return [event async for event in events]
+
+def test_event_position_round_trip():
+    position = EventPosition(messages=2, intents=1, logs=3)
+
+    assert EventPosition.parse(position.format()) == position
+
+def received(events) -> tuple[list[str], list[dict], list[str], list[str]]:
+    # What a client knows after receiving the events: messages, intents, logs and states
+    by_type: dict[str, list] = { "message": [], "intents": [], "log": [], "state": [] }
+    for event in events:
+        data = json.loads(event.data)
+        by_type[event.type].extend(data if event.type == "intents" else [data])
+    return (by_type["message"], by_type["intents"], by_type["log"], by_type["state"])
+
+def test_replay_resumes_after_any_live_event():
+    (stream, task) = run_live_task()
+
+    for count in range(1, len(stream.events)):
+        last_received = stream.events[count - 1]
+        resumed = replay_task_events(task, EventPosition.parse(last_received.id))
+
+        assert received(stream.events[:count] + resumed) == received(stream.events)
+
+def test_subscribe_resumes_after_any_replayed_event():
+    (stream, task) = run_live_task()
+    replayed = replay_task_events(task)
+
+    for count in range(1, len(replayed)):
+        last_received = replayed[count - 1]
+        resumed = asyncio.run(collect(stream.subscribe(EventPosition.parse(last_received.id))))
+
+        assert received(replayed[:count] + resumed) == received(stream.events)
+
+def test_replay_of_a_running_task_has_no_state():
+    task = create_task(["Looking up ETH"], [], [create_log("run-start")], running=True)
+
+    assert [event.type for event in replay_task_events(task)] == ["message", "log"]
+
+def test_poll_follows_a_task_running_elsewhere(monkeypatch):
+    monkeypatch.setattr("autotx.task_events.PERSISTED_TASK_POLL_INTERVAL_SEC", 0)
+    snapshots = [
+        create_task(["Looking up ETH"], [], [], running=True),
+        create_task(["Looking up ETH"], [], [create_log("run-start")], running=True),
+        create_task(["Looking up ETH", "Done"], [], [create_log("run-start")], running=False),
+    ]
+
+    async def get_task() -> models.Task:
+        return snapshots.pop(0)
+
+    events = asyncio.run(collect(poll_task_events(get_task)))
+
+    assert [(event.type, event.id) for event in events] == [
+        ("message", "1-0-0"),
+        ("log", "1-0-1"),
+        ("message", "2-0-1"),
+        ("state", "2-0-1"),
+    ]
@@ -0,0 +1,82 @@
+import threading
+from typing import Any
+
+from autotx import models, task_log_sink
+from autotx.task_log_sink import TaskLogSink
+
+class FakeTasksRepository:
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.message_batches: list[list[str]] = []
+        self.log_batches: list[list[models.TaskLog]] = []
+        self.lock = threading.Lock()
+
+    def add_messages(self, task_id: str, messages: list[str]) -> None:
+        with self.lock:
+            if self.failures > 0:
+                self.failures -= 1
+                raise Exception("Database unavailable")
+            self.message_batches.append(list(messages))
+
+    def add_logs(self, task_id: str, logs: list[models.TaskLog]) -> None:
+        with self.lock:
+            self.log_batches.append(list(logs))
+
+def create_sink(tasks: Any, **kwargs: Any) -> TaskLogSink:
+    return TaskLogSink(tasks, "task-id", **{ "flush_interval_ms": 10_000, "retry_delay_ms": 1, **kwargs })
+
+def test_writes_messages_in_batches():
+    tasks = FakeTasksRepository()
+    sink = create_sink(tasks, max_batch_size=10)
+
+    for i in range(25):
+        sink.add_message(f"message {i}")
+    sink.start()
+    sink.close()
+
+    assert [message for batch in tasks.message_batches for message in batch] == [f"message {i}" for i in range(25)]
+    assert len(tasks.message_batches) < 25
+    assert sink.writes == len(tasks.message_batches)
+    assert sink.failed_writes == 0
+
+def test_does_not_write_before_started():
+    tasks = FakeTasksRepository()
+    sink = create_sink(tasks, max_batch_size=1)
+
+    sink.add_message("queued")
+
+    assert tasks.message_batches == []
+
+    sink.close()
+
+    assert tasks.message_batches == [["queued"]]
+
+def test_retries_failed_writes_in_order():
+    tasks = FakeTasksRepository(failures=2)
+    sink = create_sink(tasks)
+
+    sink.add_message("first")
+    sink.add_message("second")
+    sink.start()
+    sink.close()
+
+    assert [message for batch in tasks.message_batches for message in batch] == ["first", "second"]
+    assert sink.failed_writes == 2
+    assert sink.dropped_entries == 0
+
+def test_drops_batch_after_max_attempts():
+    tasks = FakeTasksRepository(failures=100)
+    totals_before = task_log_sink.stats()
+    sink = create_sink(tasks, max_write_attempts=3)
+
+    sink.add_message("lost")
+    sink.close()
+
+    assert tasks.message_batches == []
+    assert sink.failed_writes == 3
+    assert sink.dropped_entries == 1
+
+    totals = task_log_sink.stats()
+    assert totals["failed_writes"] - totals_before["failed_writes"] == 3
+    assert totals["dropped_entries"] - totals_before["dropped_entries"] == 1
+    assert totals["active_sinks"] == totals_before["active_sinks"]
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from autotx import task_scheduler as task_scheduler_module
+from autotx.task_scheduler import ScheduledTask, TaskQueueFull, TaskScheduler
+
+def enqueue(scheduler: TaskScheduler, app_id: str, task_id: str) -> ScheduledTask:
+    scheduled = scheduler.enqueue(app_id)
+    scheduled.task_id = task_id
+    return scheduled
+
+def test_dispatch_order_takes_turns_between_apps():
+    scheduler = TaskScheduler(max_concurrent=1, max_queued=10)
+    for task_id in ["a1", "a2", "a3"]:
+        enqueue(scheduler, "a", task_id)
+    enqueue(scheduler, "b", "b1")
+    enqueue(scheduler, "c", "c1")
+    enqueue(scheduler, "b", "b2")
+
+    assert [scheduled.task_id for scheduled in scheduler._dispatch_order()] == ["a1", "b1", "c1", "a2", "b2", "a3"]
+
+def test_apps_take_turns_when_running():
+    scheduler = TaskScheduler(max_concurrent=1, max_queued=10)
+    started: list[str] = []
+
+    async def run_all() -> None:
+        release = asyncio.Event()
+        scheduled = [enqueue(scheduler, app_id, task_id) for (app_id, task_id) in [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1")]]
+
+        def create_run(task_id: str):
+            async def run() -> None:
+                started.append(task_id)
+                await release.wait()
+            return run
+
+        runs = [asyncio.create_task(scheduler.a_run(s, create_run(s.task_id))) for s in scheduled]
+        for _ in range(len(runs)):
+            await asyncio.sleep(0.01)
+            release.set()
+            await asyncio.sleep(0.01)
+            release.clear()
+        await asyncio.gather(*runs)
+
+    asyncio.run(run_all())
+
+    assert started == ["a1", "b1", "a2", "a3"]
+
+def test_slot_is_only_taken_when_the_run_starts():
+    scheduler = TaskScheduler(max_concurrent=1, max_queued=10)
+    enqueue(scheduler, "a", "never-run")
+
+    assert scheduler.stats()["running"] == 0
+    assert scheduler.position("never-run") is None
+
+    ran: list[str] = []
+    scheduled = enqueue(scheduler, "b", "b1")
+
+    async def run() -> None:
+        ran.append("b1")
+
+    asyncio.run(scheduler.a_run(scheduled, run))
+
+    assert ran == ["b1"]
+    assert scheduler.stats()["running"] == 0
+
+def test_drops_tasks_whose_run_never_started():
+    scheduler = TaskScheduler(max_concurrent=1, max_queued=1)
+    never_run = [enqueue(scheduler, "a", "a1"), enqueue(scheduler, "a", "a2")]
+
+    with pytest.raises(TaskQueueFull):
+        scheduler.enqueue("a")
+
+    for scheduled in never_run:
+        scheduled.enqueued_at -= task_scheduler_module.MAX_START_DELAY_SEC + 1
+    enqueue(scheduler, "b", "b1")
+
+    assert [scheduled.task_id for scheduled in scheduler._dispatch_order()] == ["b1"]
+
+def test_queue_position_counts_free_slots():
+    scheduler = TaskScheduler(max_concurrent=2, max_queued=10)
+    for task_id in ["a1", "a2", "a3", "a4"]:
+        enqueue(scheduler, "a", task_id)
+
+    assert [scheduler.position(task_id) for task_id in ["a1", "a2", "a3", "a4"]] == [None, None, 1, 2]
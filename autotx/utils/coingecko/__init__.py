@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import time
+from typing import Any, Iterator
+
+from coingecko import CoinGeckoDemoClient
+import requests
+
+from autotx.utils.constants import COINGECKO_API_KEY, COINGECKO_REQUESTS_PER_MIN
+from autotx.utils.rate_limit import Priority, RetryPolicy, TokenBucket, parse_retry_after
+
+RATE_LIMIT_BURST = 10
+
+# 429s are waited out rather than failing the run, up to a minute per request
+retry_policy = RetryPolicy(max_attempts=5, base_delay_sec=1, max_delay_sec=30, max_retry_after_sec=60)
+rate_limiter = TokenBucket(COINGECKO_REQUESTS_PER_MIN / 60, min(RATE_LIMIT_BURST, COINGECKO_REQUESTS_PER_MIN))
+
+_priority: ContextVar[Priority] = ContextVar("coingecko_priority", default=Priority.INTERACTIVE)
+_counters = { "requests": 0, "retries": 0, "rate_limited": 0 }
+_counters_lock = threading.Lock()
+
+_client: CoinGeckoDemoClient | None = None
+_client_lock = threading.Lock()
+
+@contextmanager
+def coingecko_priority(priority: Priority) -> Iterator[None]:
+    # CoinGecko requests made in this context (including threads started with asyncio.to_thread) use this priority
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def _count(counter: str) -> None:
+    with _counters_lock:
+        _counters[counter] += 1
+
+# Every CoinGecko request of the process goes through this session: it waits in line for the shared rate limiter,
+# interactive calls (the agents' tools) before background ones, and waits out 429s instead of failing
+class RateLimitedSession(requests.Session):
+    def request(self, method: str | bytes, url: str | bytes, *args: Any, **kwargs: Any) -> requests.Response:
+        attempt = 0
+        while True:
+            attempt += 1
+            rate_limiter.wait(_priority.get())
+            _count("requests")
+
+            response = super().request(method, url, *args, **kwargs)
+            if response.status_code != 429:
+                return response
+
+            _count("rate_limited")
+            delay_sec = retry_policy.get_delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+            if delay_sec is None:
+                # The client raises GeckoAPITooManyRequests
+                return response
+
+            _count("retries")
+            time.sleep(delay_sec)
+
+def get_coingecko() -> CoinGeckoDemoClient:
+    # One client for the process, so that all runs share its connections and rate limiter
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            client = CoinGeckoDemoClient(api_key=COINGECKO_API_KEY)
+            # The endpoints are created lazily from the client's session, so replacing it here covers all of them
+            client.session = RateLimitedSession()
+            _client = client
+        return _client
+
+def stats() -> dict[str, float]:
+    with _counters_lock:
+        counters = dict(_counters)
+    return { **counters, **rate_limiter.stats() }
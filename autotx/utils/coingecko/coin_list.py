@@ -0,0 +1,193 @@
+from dataclasses import dataclass
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, cast
+
+from autotx.utils.coingecko import coingecko_priority, get_coingecko
+from autotx.utils.constants import COINGECKO_COIN_LIST_TTL_SEC
+from autotx.utils.ethereum.cache import cache
+from autotx.utils.rate_limit import Priority
+
+COIN_LIST_FILE_NAME = "coingecko-coin-list.json"
+# Market cap ranks are kept for the top MARKET_CAP_RANK_PAGES * 250 coins, to rank local search results
+MARKET_CAP_RANK_PAGES = 4
+
+@dataclass(frozen=True)
+class CoinList:
+    fetched_at: float
+    # Coin id -> coin as returned by coins/list?include_platform=true (id, symbol, name and platforms)
+    by_id: Mapping[str, dict[str, Any]]
+    # (platform, lowercase address) -> coin id
+    by_platform_address: Mapping[tuple[str, str], str]
+    # Coin id -> market cap rank, for the largest coins only
+    market_cap_ranks: Mapping[str, int]
+
+    @classmethod
+    def build(cls, coins: list[dict[str, Any]], fetched_at: float, market_cap_ranks: dict[str, int]) -> "CoinList":
+        by_id: dict[str, dict[str, Any]] = {}
+        by_platform_address: dict[tuple[str, str], str] = {}
+
+        for coin in coins:
+            by_id[coin["id"]] = coin
+            for platform, address in (coin.get("platforms") or {}).items():
+                if platform and address:
+                    by_platform_address[(platform, address.lower())] = coin["id"]
+
+        return cls(
+            fetched_at=fetched_at,
+            by_id=MappingProxyType(by_id),
+            by_platform_address=MappingProxyType(by_platform_address),
+            market_cap_ranks=MappingProxyType(market_cap_ranks),
+        )
+
+    def get_coin(self, coin_id: str) -> dict[str, Any] | None:
+        return self.by_id.get(coin_id)
+
+    def get_coin_by_address(self, platform: str, address: str) -> dict[str, Any] | None:
+        coin_id = self.by_platform_address.get((platform, address.lower()))
+        return self.by_id[coin_id] if coin_id else None
+
+    def get_coins_on_platform(self, platform: str) -> list[dict[str, Any]]:
+        return [coin for coin in self.by_id.values() if platform in (coin.get("platforms") or {})]
+
+def fetch_coin_list() -> list[dict[str, Any]]:
+    return cast(list[dict[str, Any]], get_coingecko().coins.get_list(include_platform=True))
+
+def fetch_market_cap_ranks() -> dict[str, int]:
+    market_cap_ranks: dict[str, int] = {}
+    for page in range(1, MARKET_CAP_RANK_PAGES + 1):
+        coins = get_coingecko().coins.get_markets(vs_currency="usd", order="market_cap_desc", per_page=250, page=page)
+        for coin in coins:
+            if coin.get("market_cap_rank"):
+                market_cap_ranks[coin["id"]] = coin["market_cap_rank"]
+    return market_cap_ranks
+
+# The CoinGecko coin list (tens of thousands of coins with their addresses per platform) is downloaded once,
+# kept in memory and in the cache folder, and refreshed in the background once it is older than ttl_sec.
+# Readers are served the current list while it is refreshed, only the very first read waits for the download.
+class CoinListIndex:
+    folder: str
+    ttl_sec: float
+    refreshes: int
+    refresh_failures: int
+
+    def __init__(
+        self,
+        folder: str = cache.folder,
+        ttl_sec: float = COINGECKO_COIN_LIST_TTL_SEC,
+        fetch_coins: Callable[[], list[dict[str, Any]]] = fetch_coin_list,
+        fetch_ranks: Callable[[], dict[str, int]] = fetch_market_cap_ranks,
+    ):
+        self.folder = folder
+        self.ttl_sec = ttl_sec
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self._fetch_coins = fetch_coins
+        self._fetch_ranks = fetch_ranks
+        self._coin_list: CoinList | None = None
+        self._loaded_from_disk = False
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: threading.Thread | None = None
+
+    def get(self) -> CoinList:
+        coin_list = self._coin_list
+        if coin_list is None:
+            with self._lock:
+                if not self._loaded_from_disk:
+                    self._coin_list = self._load()
+                    self._loaded_from_disk = True
+                coin_list = self._coin_list
+
+        if coin_list is None:
+            return self.refresh()
+
+        if time.time() - coin_list.fetched_at > self.ttl_sec:
+            self._refresh_in_background()
+
+        return coin_list
+
+    def refresh(self) -> CoinList:
+        # Only one download at a time, callers arriving meanwhile get the list it fetched
+        started_at = time.time()
+        with self._refresh_lock:
+            coin_list = self._coin_list
+            if coin_list and coin_list.fetched_at >= started_at:
+                return coin_list
+
+            try:
+                coins = self._fetch_coins()
+            except Exception:
+                with self._lock:
+                    self.refresh_failures += 1
+                raise
+
+            try:
+                market_cap_ranks = self._fetch_ranks()
+            except Exception as e:
+                # Ranks only order search results, the previous ones are kept rather than failing the refresh
+                print(f"Failed to fetch CoinGecko market cap ranks: {e}")
+                market_cap_ranks = dict(coin_list.market_cap_ranks) if coin_list else {}
+
+            coin_list = CoinList.build(coins, time.time(), market_cap_ranks)
+            with self._lock:
+                self._coin_list = coin_list
+                self.refreshes += 1
+            self._save(coins, coin_list.fetched_at, market_cap_ranks)
+
+            return coin_list
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            coin_list = self._coin_list
+            return {
+                "size": len(coin_list.by_id) if coin_list else 0,
+                "age_sec": int(time.time() - coin_list.fetched_at) if coin_list else 0,
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+            }
+
+    def _refresh_in_background(self) -> None:
+        def refresh() -> None:
+            try:
+                # Readers are not waiting for it, so the agents' requests go first
+                with coingecko_priority(Priority.BACKGROUND):
+                    self.refresh()
+            except Exception as e:
+                # The current list keeps being served and the refresh is attempted again on the next read
+                print(f"Failed to refresh the CoinGecko coin list: {e}")
+
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=refresh, daemon=True)
+            self._refresh_thread.start()
+
+    def _path(self) -> str:
+        return os.path.join(self.folder, COIN_LIST_FILE_NAME)
+
+    def _load(self) -> CoinList | None:
+        try:
+            with open(self._path(), "r") as f:
+                data = json.load(f)
+            return CoinList.build(data["coins"], data["fetched_at"], data.get("market_cap_ranks", {}))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable CoinGecko coin list cache: {e}")
+            return None
+
+    def _save(self, coins: list[dict[str, Any]], fetched_at: float, market_cap_ranks: dict[str, int]) -> None:
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            path = self._path()
+            with open(f"{path}.tmp", "w") as f:
+                json.dump({ "fetched_at": fetched_at, "coins": coins, "market_cap_ranks": market_cap_ranks }, f)
+            os.replace(f"{path}.tmp", path)
+        except Exception as e:
+            print(f"Failed to write the CoinGecko coin list cache: {e}")
+
+coin_list = CoinListIndex()
@@ -0,0 +1,96 @@
+import asyncio
+from concurrent.futures import Future
+import threading
+from typing import Any, Callable, Hashable, TypeVar
+
+from autotx.utils.ttl_cache import TTLCache
+
+T = TypeVar("T")
+
+MAX_CACHED_RESPONSES_PER_ENDPOINT = 1000
+
+# How long a response is reused: categories barely change, prices and markets move within minutes
+ENDPOINT_TTL_SEC: dict[str, float] = {
+    "categories": 6 * 3600,
+    "search": 3600,
+    "coin": 60,
+    "markets": 60,
+}
+DEFAULT_TTL_SEC = 60
+
+# Shared by every run of the process: responses are cached per endpoint and identical requests in flight
+# are coalesced into a single upstream call, across the event loops of the process.
+# Cached responses are shared between callers and must not be mutated.
+class CoinGeckoResponseCache:
+    def __init__(self, endpoint_ttl_sec: dict[str, float] = ENDPOINT_TTL_SEC):
+        self.endpoint_ttl_sec = endpoint_ttl_sec
+        self.coalesced = 0
+        self._caches: dict[str, TTLCache[Any]] = {}
+        self._in_flight: dict[tuple[str, Hashable], Future[Any]] = {}
+        self._lock = threading.Lock()
+
+    async def a_get(self, endpoint: str, key: Hashable, fetch: Callable[[], T]) -> tuple[T, bool]:
+        # Returns the response and whether it was served without calling CoinGecko.
+        # fetch is run in a thread so that the event loop is not blocked meanwhile
+        (value, future, is_leader) = self._lookup(endpoint, key)
+        if future is None:
+            return (value, True)
+        if is_leader:
+            await asyncio.to_thread(self._fetch, endpoint, key, future, fetch)
+        return (await asyncio.wrap_future(future), not is_leader)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            caches = dict(self._caches)
+            stats = { "coalesced": self.coalesced, "in_flight": len(self._in_flight) }
+
+        for endpoint, cache in caches.items():
+            cache_stats = cache.stats()
+            stats[f"{endpoint}_hits"] = cache_stats["hits"]
+            stats[f"{endpoint}_misses"] = cache_stats["misses"]
+
+        return stats
+
+    def _get_cache(self, endpoint: str) -> TTLCache[Any]:
+        cache = self._caches.get(endpoint)
+        if not cache:
+            cache = TTLCache(
+                ttl_sec=self.endpoint_ttl_sec.get(endpoint, DEFAULT_TTL_SEC),
+                max_size=MAX_CACHED_RESPONSES_PER_ENDPOINT,
+            )
+            self._caches[endpoint] = cache
+        return cache
+
+    def _lookup(self, endpoint: str, key: Hashable) -> tuple[Any, Future[Any] | None, bool]:
+        # Returns the cached response, or else the request in flight to wait for or a new one to fetch (is_leader)
+        with self._lock:
+            value = self._get_cache(endpoint).get(key)
+            if value is not None:
+                return (value, None, False)
+
+            future = self._in_flight.get((endpoint, key))
+            if future:
+                self.coalesced += 1
+                return (None, future, False)
+
+            future = Future()
+            self._in_flight[(endpoint, key)] = future
+            return (None, future, True)
+
+    def _fetch(self, endpoint: str, key: Hashable, future: Future[Any], fetch: Callable[[], Any]) -> None:
+        try:
+            value = fetch()
+        except BaseException as e:
+            # Errors are not cached, the callers waiting for this request get the error and the next one retries
+            with self._lock:
+                del self._in_flight[(endpoint, key)]
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            if value is not None:
+                self._get_cache(endpoint).set(key, value)
+            del self._in_flight[(endpoint, key)]
+        future.set_result(value)
+
+coingecko_responses = CoinGeckoResponseCache()
@@ -0,0 +1,93 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+import sys
+import threading
+from typing import Sequence
+
+from autotx.utils.coingecko import coingecko_priority
+from autotx.utils.coingecko.coin_list import CoinList, coin_list
+from autotx.utils.rate_limit import Priority
+
+MAX_SEARCH_RESULTS = 10
+UNRANKED = sys.maxsize
+
+@dataclass(frozen=True)
+class SymbolSearchIndex:
+    # (lowercase symbol, market cap rank, coin id), sorted so that exact and prefix matches are contiguous and ranked
+    symbols: list[tuple[str, int, str]]
+    # (lowercase name, market cap rank, coin id), sorted the same way
+    names: list[tuple[str, int, str]]
+    market_cap_ranks: dict[str, int]
+
+    @classmethod
+    def build(cls, coins: CoinList) -> "SymbolSearchIndex":
+        market_cap_ranks = dict(coins.market_cap_ranks)
+        symbols: list[tuple[str, int, str]] = []
+        names: list[tuple[str, int, str]] = []
+
+        for coin_id, coin in coins.by_id.items():
+            rank = market_cap_ranks.get(coin_id, UNRANKED)
+            if coin.get("symbol"):
+                symbols.append((coin["symbol"].lower(), rank, coin_id))
+            if coin.get("name"):
+                names.append((coin["name"].lower(), rank, coin_id))
+
+        return cls(symbols=sorted(symbols), names=sorted(names), market_cap_ranks=market_cap_ranks)
+
+    def search(self, query: str, preferred_ids: Sequence[str] = (), limit: int = MAX_SEARCH_RESULTS) -> list[str]:
+        # Returns coin ids matching the query case-insensitively, by symbol then by name, largest market cap first.
+        # Prefix matches are only returned when nothing matches exactly. preferred_ids that match come first.
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        matches = [
+            *self._exact_matches(self.symbols, query),
+            *self._exact_matches(self.names, query),
+        ]
+        if not matches:
+            matches = sorted(
+                [*self._prefix_matches(self.symbols, query), *self._prefix_matches(self.names, query)],
+                key=lambda coin_id: (self.market_cap_ranks.get(coin_id, UNRANKED), coin_id),
+            )
+
+        coin_ids = list(dict.fromkeys(matches))
+        preferred = [coin_id for coin_id in preferred_ids if coin_id in coin_ids]
+        return list(dict.fromkeys([*preferred, *coin_ids]))[:limit]
+
+    def _exact_matches(self, entries: list[tuple[str, int, str]], query: str) -> list[str]:
+        start = bisect_left(entries, (query,))
+        end = bisect_left(entries, (query, UNRANKED + 1))
+        return [coin_id for (_, _, coin_id) in entries[start:end]]
+
+    def _prefix_matches(self, entries: list[tuple[str, int, str]], query: str) -> list[str]:
+        start = bisect_left(entries, (query,))
+        end = bisect_left(entries, (query + chr(sys.maxunicode),))
+        return [coin_id for (_, _, coin_id) in entries[start:end]]
+
+_index: SymbolSearchIndex | None = None
+_index_source: CoinList | None = None
+_index_lock = threading.Lock()
+
+def get_symbol_search_index() -> SymbolSearchIndex:
+    # Rebuilt whenever the coin list is refreshed
+    global _index, _index_source
+
+    coins = coin_list.get()
+    with _index_lock:
+        if _index is None or _index_source is not coins:
+            _index = SymbolSearchIndex.build(coins)
+            _index_source = coins
+        return _index
+
+def warm_symbol_search_index() -> None:
+    # Loads the coin list (downloading it when it is not cached yet) and builds the index in a background thread,
+    # so that the first token search does not wait for them. Searches made meanwhile wait for the same download
+    def build() -> None:
+        try:
+            with coingecko_priority(Priority.BACKGROUND):
+                get_symbol_search_index()
+        except Exception as e:
+            print(f"Failed to load the CoinGecko coin list: {e}")
+
+    threading.Thread(target=build, name="symbol-search-index-warm-up", daemon=True).start()
@@ -1,7 +1,12 @@
+import asyncio
+import copy
 import os
 import sys
+import threading
 from time import sleep
 
+from requests import Session
+from requests.adapters import HTTPAdapter
 from web3 import HTTPProvider, Web3
 from autotx.get_env_vars import get_env_vars
 from eth_typing import URI
@@ -12,6 +17,20 @@ from autotx.utils.is_dev_env import is_dev_env
 
 smart_account_addr = get_env_vars()
 
+RPC_CONNECTION_ATTEMPTS = 16
+RPC_POOL_MAXSIZE = 32
+
+class RpcConnectionError(Exception):
+    pass
+
+def create_rpc_session() -> Session:
+    # Without a session web3 uses one it caches per URL, with the default pool size and never closed
+    session = Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=RPC_POOL_MAXSIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 class AppConfig:
     rpc_url: str
     web3: Web3
@@ -20,8 +39,11 @@ class AppConfig:
     def __init__(
         self,
         subsidized_chain_id: int | None = None, 
+        session: Session | None = None,
+        exit_on_connection_error: bool = True,
     ):
         rpc_url: str
+        network_info: NetworkInfo | None = None
 
         if subsidized_chain_id:
             network_info = NetworkInfo.from_chain_id(subsidized_chain_id)
@@ -39,11 +61,13 @@ class AppConfig:
             
             rpc_url = provided_rpc_url
             
-        web3 = Web3(HTTPProvider(rpc_url))
-        for i in range(16):
+        web3 = Web3(HTTPProvider(rpc_url, session=session))
+        for i in range(RPC_CONNECTION_ATTEMPTS):
             if web3.is_connected():
                 break
-            if i == 15:
+            if i == RPC_CONNECTION_ATTEMPTS - 1:
+                if not exit_on_connection_error:
+                    raise RpcConnectionError(f"Can not connect with node of chain {subsidized_chain_id}")
                 if is_dev_env():
                     sys.exit("Can not connect with local node. Did you run `poetry run start-devnet`?")
                 else:
@@ -52,4 +76,121 @@ class AppConfig:
 
         self.rpc_url = rpc_url
         self.web3 = web3
-        self.network_info = NetworkInfo(web3.eth.chain_id)
+        # The subsidized RPC URL is picked by chain ID, so its network info can be reused
+        self.network_info = network_info if network_info else NetworkInfo(web3.eth.chain_id)
+
+    def with_own_network_info(self) -> "AppConfig":
+        # Same connection, with a token registry of its own, so tokens added by one user are not seen by the others
+        config = copy.copy(self)
+        config.network_info = NetworkInfo(self.network_info.chain_id.value)
+        return config
+
+HEALTH_CHECK_INTERVAL_SEC = 30
+
+# Process-wide registry of connected AppConfigs, one per chain (None being the CHAIN_RPC_URL/devnet chain).
+# The calls made through a config's web3 share the chain's pooled HTTP session, while the Safe and Multicall calls
+# go through the EthereumClient shared per RPC URL (see ethereum_client.py), which keeps a session of its own.
+# Callers get a copy of the config with its own NetworkInfo, so the token registries of runs stay separate.
+# A background thread checks the nodes are still reachable and drops the configs that are not,
+# so they are rebuilt on their next use
+class AppConfigRegistry:
+    health_check_interval_sec: float
+    builds: int
+    failed_health_checks: int
+
+    def __init__(self, health_check_interval_sec: float = HEALTH_CHECK_INTERVAL_SEC):
+        self.health_check_interval_sec = health_check_interval_sec
+        self.builds = 0
+        self.failed_health_checks = 0
+        self._configs: dict[int | None, AppConfig] = {}
+        self._sessions: dict[int | None, Session] = {}
+        self._chain_locks: dict[int | None, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._health_check_thread: threading.Thread | None = None
+
+    def get(self, chain_id: int | None = None) -> AppConfig:
+        return self._get_shared(chain_id).with_own_network_info()
+
+    def _get_shared(self, chain_id: int | None) -> AppConfig:
+        config = self._configs.get(chain_id)
+        if config:
+            return config
+
+        with self._lock:
+            chain_lock = self._chain_locks.setdefault(chain_id, threading.Lock())
+
+        # Only one request builds the config of a chain, the others wait for it
+        with chain_lock:
+            config = self._configs.get(chain_id)
+            if config:
+                return config
+
+            with self._lock:
+                session = self._sessions.setdefault(chain_id, create_rpc_session())
+
+            config = AppConfig(subsidized_chain_id=chain_id, session=session, exit_on_connection_error=False)
+
+            with self._lock:
+                self._configs[chain_id] = config
+                self.builds += 1
+
+        self._start_health_checks()
+
+        return config
+
+    async def a_get(self, chain_id: int | None = None) -> AppConfig:
+        config = self._configs.get(chain_id)
+        if config:
+            return config.with_own_network_info()
+
+        return await asyncio.to_thread(self.get, chain_id)
+
+    def close(self) -> None:
+        self._stop.set()
+
+        with self._lock:
+            self._configs.clear()
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "chains": len(self._configs),
+                "builds": self.builds,
+                "failed_health_checks": self.failed_health_checks,
+            }
+
+    def _start_health_checks(self) -> None:
+        with self._lock:
+            if self._health_check_thread is not None:
+                return
+            self._stop.clear()
+            self._health_check_thread = threading.Thread(target=self._check_health, name="app-config-health-check", daemon=True)
+            self._health_check_thread.start()
+
+    def _check_health(self) -> None:
+        while not self._stop.wait(self.health_check_interval_sec):
+            with self._lock:
+                configs = list(self._configs.items())
+
+            for chain_id, config in configs:
+                try:
+                    connected = config.web3.is_connected()
+                except Exception:
+                    connected = False
+
+                if not connected:
+                    with self._lock:
+                        self.failed_health_checks += 1
+                        if self._configs.get(chain_id) is config:
+                            del self._configs[chain_id]
+
+        with self._lock:
+            self._health_check_thread = None
+
+app_configs = AppConfigRegistry()
@@ -6,7 +6,15 @@ OPENAI_MODEL_NAME = os.environ.get("OPENAI_MODEL_NAME", "gpt-4o")
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", None)
 OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
 COINGECKO_API_KEY = os.environ.get("COINGECKO_API_KEY", None)
+# Client-side limit of CoinGecko requests shared by all runs of the process, defaults to the demo plan's limit
+COINGECKO_REQUESTS_PER_MIN = float(os.environ.get("COINGECKO_REQUESTS_PER_MIN") or "30")
+# How long the locally kept CoinGecko coin list is used before it is refreshed in the background
+COINGECKO_COIN_LIST_TTL_SEC = float(os.environ.get("COINGECKO_COIN_LIST_TTL_SEC") or "86400")
 LIFI_API_KEY = os.environ.get("LIFI_API_KEY", None)
+# How long a Li.Fi quote fetched to validate a swap can be reused to build its transactions
+LIFI_QUOTE_TTL_SEC = float(os.environ.get("LIFI_QUOTE_TTL_SEC") or "30")
+# Client-side limit of Li.Fi requests, defaults to the public limit without an API key and 100 a minute with one
+LIFI_REQUESTS_PER_HOUR = float(os.environ.get("LIFI_REQUESTS_PER_HOUR") or ("6000" if LIFI_API_KEY else "100"))
 ALCHEMY_API_KEY = os.environ.get("ALCHEMY_API_KEY")
 MAINNET_DEFAULT_RPC = f"https://eth-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
 SMART_ACCOUNT_OWNER_PK = os.environ.get("SMART_ACCOUNT_OWNER_PK", None)
\ No newline at end of file
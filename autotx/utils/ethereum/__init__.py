@@ -5,9 +5,11 @@ from .cache import cache
 from .transfer_erc20 import transfer_erc20
 from .build_transfer_erc20 import build_transfer_erc20
 from .get_erc20_balance import get_erc20_balance
+from .get_balances import get_balances
 from .SafeManager import SafeManager
 from .build_approve_erc20 import build_approve_erc20
 from .get_erc20_info import get_erc20_info
+from .token_metadata import token_metadata
 from .is_valid_safe import is_valid_safe
 from .send_native import send_native
 from .get_native_balance import get_native_balance
@@ -25,7 +27,9 @@ __all__ = [
     "build_transfer_erc20",
     "build_approve_erc20",
     "get_erc20_balance",
+    "get_balances",
     "get_erc20_info",
+    "token_metadata",
     "SafeManager",
     "is_valid_safe",
 ]
\ No newline at end of file
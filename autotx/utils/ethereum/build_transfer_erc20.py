@@ -4,10 +4,11 @@ from web3.types import TxParams, Wei
 from autotx.eth_address import ETHAddress
 from .constants import GAS_PRICE_MULTIPLIER
 from .erc20_abi import ERC20_ABI
+from .token_metadata import token_metadata
 
 def build_transfer_erc20(web3: Web3, token_address: ETHAddress, to: ETHAddress, value: float, from_address: ETHAddress) -> TxParams:
     erc20 = web3.eth.contract(address=token_address.hex, abi=ERC20_ABI)
-    decimals = erc20.functions.decimals().call()
+    decimals = token_metadata.get(web3, token_address).decimals
     tx: TxParams = erc20.functions.transfer(
         to.hex, int(value * 10**decimals)
     ).build_transaction(
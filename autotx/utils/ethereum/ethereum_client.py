@@ -0,0 +1,30 @@
+import threading
+
+from eth_typing import URI
+from gnosis.eth import EthereumClient
+from web3 import Web3
+
+_clients: dict[str, EthereumClient] = {}
+_clients_lock = threading.Lock()
+
+def get_ethereum_client_for_url(rpc_url: str) -> EthereumClient:
+    # One EthereumClient per RPC endpoint: it keeps its own pooled HTTP session,
+    # and creating one costs an RPC call (it looks up the chain and its Multicall contract).
+    # It is created outside the lock so that a slow endpoint does not hold up the lookups of the other ones,
+    # if two callers race to create the same client the first one stored is kept.
+    with _clients_lock:
+        client = _clients.get(rpc_url)
+    if client is not None:
+        return client
+
+    client = EthereumClient(URI(rpc_url))
+
+    with _clients_lock:
+        return _clients.setdefault(rpc_url, client)
+
+def get_ethereum_client(web3: Web3) -> EthereumClient | None:
+    endpoint_uri = getattr(web3.provider, "endpoint_uri", None)
+    if not endpoint_uri:
+        return None
+
+    return get_ethereum_client_for_url(str(endpoint_uri))
@@ -0,0 +1,48 @@
+from typing import Any, Sequence
+from gnosis.eth import EthereumNetworkNotSupported
+from gnosis.eth.exceptions import BatchCallException
+from requests.exceptions import RequestException
+from web3 import Web3
+from web3.exceptions import Web3Exception
+
+from autotx.eth_address import ETHAddress
+from .constants import NATIVE_TOKEN_ADDRESS
+from .erc20_abi import ERC20_ABI
+from .ethereum_client import get_ethereum_client
+from .token_metadata import token_metadata
+
+def get_balances(web3: Web3, account: ETHAddress, token_addresses: Sequence[ETHAddress]) -> dict[str, float]:
+    # Reads the balances of many tokens (native included) in a single aggregated call, keyed by lowercase token address
+    include_native = any(address.hex == NATIVE_TOKEN_ADDRESS for address in token_addresses)
+    erc20_addresses = list({ address.hex.lower(): address for address in token_addresses if address.hex != NATIVE_TOKEN_ADDRESS }.values())
+
+    decimals = { address: metadata.decimals for address, metadata in token_metadata.get_many(web3, erc20_addresses).items() }
+    contracts = [web3.eth.contract(address=address.hex, abi=ERC20_ABI) for address in erc20_addresses]
+    functions: list[Any] = [contract.functions.balanceOf(account.hex) for contract in contracts]
+
+    results: list[Any] = [None] * (len(functions) + 1)
+    try:
+        client = get_ethereum_client(web3)
+        multicall = client.multicall if client else None
+        if client:
+            if include_native and multicall:
+                functions.append(multicall.contract.functions.getEthBalance(account.hex))
+            results = client.batch_call(functions, raise_exception=False)
+    except (BatchCallException, EthereumNetworkNotSupported, Web3Exception, ValueError, RequestException) as e:
+        # The balances are then read one call at a time below
+        print(f"Failed to batch the balance calls of {len(functions)} tokens: {e}")
+
+    balances: dict[str, float] = {}
+    for i, address in enumerate(erc20_addresses):
+        balance = results[i]
+        if balance is None:
+            balance = contracts[i].functions.balanceOf(account.hex).call()
+        balances[address.hex.lower()] = balance / 10 ** decimals[address.hex.lower()]
+
+    if include_native:
+        native_balance = results[len(erc20_addresses)] if len(results) > len(erc20_addresses) else None
+        if native_balance is None:
+            native_balance = web3.eth.get_balance(account.hex)
+        balances[NATIVE_TOKEN_ADDRESS.lower()] = native_balance / 10 ** 18
+
+    return balances
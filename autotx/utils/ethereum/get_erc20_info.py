@@ -1,13 +1,9 @@
 from web3 import Web3
 
 from autotx.eth_address import ETHAddress
-from .erc20_abi import ERC20_ABI
+from .token_metadata import token_metadata
 
 def get_erc20_info(web3: Web3, token_address: ETHAddress) -> tuple[str, str, int]:
-    erc20 = web3.eth.contract(address=token_address.hex, abi=ERC20_ABI)
+    metadata = token_metadata.get(web3, token_address)
 
-    name = erc20.functions.name().call()
-    symbol = erc20.functions.symbol().call()
-    decimals = erc20.functions.decimals().call()
-
-    return name, symbol, decimals
\ No newline at end of file
+    return metadata.name, metadata.symbol, metadata.decimals
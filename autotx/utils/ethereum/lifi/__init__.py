@@ -1,11 +1,14 @@
 import asyncio
-from typing import Any
+from typing import Any, Coroutine, TypeVar
+import json
 import re
+import threading
 import aiohttp
 
-from autotx.utils.constants import LIFI_API_KEY
+from autotx.utils.constants import LIFI_API_KEY, LIFI_REQUESTS_PER_HOUR
 from autotx.eth_address import ETHAddress
 from autotx.utils.ethereum.networks import ChainId
+from autotx.utils.rate_limit import CircuitBreaker, CircuitState, RateLimitExceededError, RetryPolicy, TokenBucket, parse_retry_after
 
 
 class LifiApiError(Exception):
@@ -18,23 +21,43 @@ class TokenNotSupported(LifiApiError):
         self.token_address = token_address
 
 
+class LifiRateLimitError(LifiApiError):
+    def __init__(self, retry_after_sec: float | None):
+        super().__init__("Rate limit exceeded")
+        self.retry_after_sec = retry_after_sec
+
+
+# Server errors, which are retried and count towards opening the circuit breaker
+class LifiUnavailableError(LifiApiError):
+    pass
+
+
 async def handle_lifi_response(response: aiohttp.ClientResponse) -> dict[str, Any]:
-    response_json: dict[str, Any] = await response.json()
-    if response.status == 200:
+    response_json: Any = None
+    try:
+        response_json = await response.json(content_type=None)
+    except (aiohttp.ContentTypeError, json.JSONDecodeError):
+        pass
+
+    if response.status == 200 and isinstance(response_json, dict):
         return response_json
 
-    if response_json["code"] == 1011:
-        match = re.search(r"0x[a-fA-F0-9]+", response_json["message"])
+    message = response_json.get("message") if isinstance(response_json, dict) else None
+    code = response_json.get("code") if isinstance(response_json, dict) else None
+
+    if code == 1011 and message:
+        match = re.search(r"0x[a-fA-F0-9]+", message)
         if match:
             token_address = match.group()
             raise TokenNotSupported(token_address)
 
-    if response.status == 429 or (
-        response_json["message"] == "Unauthorized" and response_json["code"] == 1005
-    ):
-        raise LifiApiError("Rate limit exceeded")
+    if response.status == 429 or (message == "Unauthorized" and code == 1005):
+        raise LifiRateLimitError(parse_retry_after(response.headers.get("Retry-After")))
+
+    if response.status >= 500 or message is None:
+        raise LifiUnavailableError(f"Li.Fi responded with status {response.status}: {message or response.reason}")
 
-    raise LifiApiError(f"Fetch quote failed with error: {response_json['message']}")
+    raise LifiApiError(f"Fetch quote failed with error: {message}")
 
 
 def add_authorization_info_if_provided(params: dict[str, Any]) -> dict[str, Any] | None:
@@ -45,8 +68,159 @@ def add_authorization_info_if_provided(params: dict[str, Any]) -> dict[str, Any]
     return headers
 
 
+T = TypeVar("T")
+
 class Lifi:
     BASE_URL = "https://li.quest/v1"
+    CONNECTION_LIMIT = 32
+    CONNECTION_LIMIT_PER_HOST = 16
+    KEEPALIVE_TIMEOUT_SEC = 60
+    DNS_CACHE_TTL_SEC = 300
+    REQUEST_TIMEOUT_SEC = 10
+    RATE_LIMIT_BURST = 100
+
+    # Only rate limits, timeouts, connection and server errors are retried, an answer such as "No available quotes" is final
+    retry_policy = RetryPolicy(max_attempts=5, base_delay_sec=0.5, max_delay_sec=8)
+    circuit_breaker = CircuitBreaker("Li.Fi", failure_threshold=5, reset_timeout_sec=30)
+
+    # Li.Fi rate limits per API key, so the client-side limiters are too
+    _rate_limiters: dict[str | None, TokenBucket] = {}
+    _counters = { "requests": 0, "retries": 0, "rate_limited": 0, "failures": 0 }
+    _stats_lock = threading.Lock()
+
+    # aiohttp sessions are bound to the event loop that created them, so there is one per running loop
+    _sessions: dict[int, tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+    _sessions_lock = threading.Lock()
+
+    @classmethod
+    async def get_session(cls) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+
+        with cls._sessions_lock:
+            # Sessions of loops that were closed without Lifi.close (e.g. asyncio.run instead of Lifi.run)
+            abandoned = [key for key, (session_loop, _) in cls._sessions.items() if session_loop.is_closed()]
+            abandoned_sessions = [cls._sessions.pop(key)[1] for key in abandoned]
+
+            entry = cls._sessions.get(id(loop))
+            if entry and entry[0] is loop and not entry[1].closed:
+                session = entry[1]
+            else:
+                connector = aiohttp.TCPConnector(
+                    limit=cls.CONNECTION_LIMIT,
+                    limit_per_host=cls.CONNECTION_LIMIT_PER_HOST,
+                    keepalive_timeout=cls.KEEPALIVE_TIMEOUT_SEC,
+                    use_dns_cache=True,
+                    ttl_dns_cache=cls.DNS_CACHE_TTL_SEC,
+                )
+                session = aiohttp.ClientSession(connector=connector)
+                cls._sessions[id(loop)] = (loop, session)
+
+        for abandoned_session in abandoned_sessions:
+            # Their loop is gone, so this only marks their connector as closed, without any I/O on that loop
+            await abandoned_session.close()
+
+        return session
+
+    @classmethod
+    async def close(cls) -> None:
+        # Closes the session of the running loop, call it before the loop is shut down
+        loop = asyncio.get_running_loop()
+
+        with cls._sessions_lock:
+            entry = cls._sessions.get(id(loop))
+            if entry and entry[0] is loop:
+                del cls._sessions[id(loop)]
+
+        if entry and entry[0] is loop:
+            await entry[1].close()
+
+    @classmethod
+    def run(cls, coroutine: Coroutine[Any, Any, T]) -> T:
+        # asyncio.run that closes the Li.Fi session before its loop is shut down
+        async def run_and_close() -> T:
+            try:
+                return await coroutine
+            finally:
+                await cls.close()
+
+        return asyncio.run(run_and_close())
+
+    @classmethod
+    def get_rate_limiter(cls) -> TokenBucket:
+        with cls._stats_lock:
+            limiter = cls._rate_limiters.get(LIFI_API_KEY)
+            if not limiter:
+                limiter = TokenBucket(LIFI_REQUESTS_PER_HOUR / 3600, min(cls.RATE_LIMIT_BURST, LIFI_REQUESTS_PER_HOUR))
+                cls._rate_limiters[LIFI_API_KEY] = limiter
+            return limiter
+
+    @classmethod
+    def _count(cls, counter: str) -> None:
+        with cls._stats_lock:
+            cls._counters[counter] += 1
+
+    @classmethod
+    def stats(cls) -> dict[str, Any]:
+        limiter = cls.get_rate_limiter().stats()
+        breaker = cls.circuit_breaker.stats()
+        with cls._stats_lock:
+            return {
+                **cls._counters,
+                "throttled": limiter["throttled"],
+                "throttle_rejected": limiter["rejected"],
+                "throttle_wait_sec": limiter["throttle_wait_sec"],
+                "circuit_state": breaker["state"],
+                "circuit_opened": breaker["opened"],
+                "circuit_rejected": breaker["rejected"],
+            }
+
+    @classmethod
+    async def request(cls, method: str, path: str, **kwargs: Any) -> dict[str, Any]:
+        session = await cls.get_session()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            # The token is taken first, so that a trial call of the circuit breaker is not kept waiting for it.
+            # A caller is not kept waiting for it longer than for a Retry-After of Li.Fi, it gets a rate limit error instead
+            try:
+                await cls.get_rate_limiter().acquire(cls.retry_policy.max_retry_after_sec)
+            except RateLimitExceededError as e:
+                raise LifiRateLimitError(e.retry_in_sec) from e
+            cls.circuit_breaker.before_call()
+            cls._count("requests")
+
+            retry_after_sec: float | None = None
+            try:
+                async with session.request(method, cls.BASE_URL + path, timeout=cls.REQUEST_TIMEOUT_SEC, **kwargs) as response:
+                    result = await handle_lifi_response(response)
+            except LifiRateLimitError as e:
+                # Li.Fi is up and only asks to slow down
+                cls.circuit_breaker.record_success()
+                cls._count("rate_limited")
+                error: Exception = e
+                retry_after_sec = e.retry_after_sec
+            except (LifiUnavailableError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                cls.circuit_breaker.record_failure()
+                cls._count("failures")
+                error = e
+            except Exception:
+                cls.circuit_breaker.record_success()
+                raise
+            except BaseException:
+                # Cancelled, the call has no outcome
+                cls.circuit_breaker.release()
+                raise
+            else:
+                cls.circuit_breaker.record_success()
+                return result
+
+            delay_sec = cls.retry_policy.get_delay(attempt, retry_after_sec)
+            if delay_sec is None or cls.circuit_breaker.state == CircuitState.OPEN:
+                raise error
+
+            cls._count("retries")
+            await asyncio.sleep(delay_sec)
 
     @classmethod
     async def get_quote_to_amount(
@@ -69,27 +243,7 @@ class Lifi:
             "contractCalls": [],
         }
         headers = add_authorization_info_if_provided(params)
-       
-        async with aiohttp.ClientSession() as session:
-            attempt_count = 0
-            while True:
-                try:
-                    response = await session.post(cls.BASE_URL + "/quote/contractCalls", json=params, headers=headers, timeout=10)
-                    result = await handle_lifi_response(response)
-                    return result
-                except asyncio.TimeoutError as e:
-                    if attempt_count < 5:
-                        attempt_count += 1
-                        await asyncio.sleep(0.5)                   
-                        continue
-                    raise e
-                except Exception as e:
-                    if "No available quotes for the requested transfer" in str(e) or "Unable to find quote to match expected output" in str(e):
-                        if attempt_count < 5:
-                            attempt_count += 1
-                            await asyncio.sleep(0.5)                   
-                            continue
-                    raise e
+        return await cls.request("POST", "/quote/contractCalls", json=params, headers=headers)
 
     @classmethod
     async def get_quote_from_amount(
@@ -111,24 +265,4 @@ class Lifi:
             "slippage": slippage,
         }
         headers = add_authorization_info_if_provided(params)
-
-        async with aiohttp.ClientSession() as session:
-            attempt_count = 0
-            while True:
-                try:
-                    response = await session.get(cls.BASE_URL + "/quote", params=params, headers=headers, timeout=10)
-                    result = await handle_lifi_response(response)
-                    return result
-                except asyncio.TimeoutError as e:
-                    if attempt_count < 5:
-                        attempt_count += 1
-                        await asyncio.sleep(0.5)                   
-                        continue
-                    raise e
-                except Exception as e:
-                    if "No available quotes for the requested transfer" in str(e) or "Unable to find quote to match expected output" in str(e):
-                        if attempt_count < 5:
-                            attempt_count += 1
-                            await asyncio.sleep(0.5)                   
-                            continue
-                    raise e
\ No newline at end of file
+        return await cls.request("GET", "/quote", params=params, headers=headers)
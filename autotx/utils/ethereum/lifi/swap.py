@@ -1,5 +1,5 @@
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from decimal import Decimal
 from typing import Any, cast
 
@@ -14,9 +14,13 @@ from autotx.utils.ethereum.helpers.get_native_token_symbol import (
 )
 from autotx.utils.ethereum.lifi import Lifi, TokenNotSupported
 from autotx.utils.ethereum.networks import ChainId
+from autotx.utils.ethereum.token_metadata import token_metadata
+from autotx.utils.constants import LIFI_QUOTE_TTL_SEC
+from autotx.utils.ttl_cache import TTLCache
 from web3.types import TxParams, Wei
 
 SLIPPAGE = 0.005  # 0.5%
+QUOTE_CACHE_MAX_SIZE = 1000
 
 SUPPORTED_NETWORKS_BY_LIFI = [
     ChainId.MAINNET,
@@ -36,6 +40,29 @@ class QuoteInformation:
     transaction: TxParams
     exchange_name: str
 
+# Quotes are only reused while fresh (LIFI_QUOTE_TTL_SEC), after that prices and gas have moved and the swap is re-quoted
+quote_cache: TTLCache[QuoteInformation] = TTLCache(ttl_sec=LIFI_QUOTE_TTL_SEC, max_size=QUOTE_CACHE_MAX_SIZE)
+
+def copy_quote(quote: QuoteInformation) -> QuoteInformation:
+    # The transaction ends up in the built transactions, so callers get their own copy and the cached one stays intact
+    return replace(quote, transaction=TxParams(**quote.transaction))
+
+def get_quote_cache_key(
+    token_in_address: ETHAddress,
+    token_out_address: ETHAddress,
+    chain: ChainId,
+    expected_amount: Decimal,
+    amount_is_output: bool,
+    from_address: ETHAddress,
+) -> tuple[int, str, str, Decimal, bool, str]:
+    return (
+        chain.value,
+        token_in_address.hex.lower(),
+        token_out_address.hex.lower(),
+        expected_amount,
+        amount_is_output,
+        from_address.hex.lower(),
+    )
 
 async def get_quote(
     token_in_address: ETHAddress,
@@ -48,6 +75,39 @@ async def get_quote(
     expected_amount: Decimal,
     amount_is_output: bool,
     from_address: ETHAddress,
+) -> QuoteInformation:
+    cache_key = get_quote_cache_key(token_in_address, token_out_address, chain, expected_amount, amount_is_output, from_address)
+    cached_quote = quote_cache.get(cache_key)
+    if cached_quote:
+        return copy_quote(cached_quote)
+
+    quote = await fetch_quote(
+        token_in_address,
+        token_in_decimals,
+        token_in_symbol,
+        token_out_address,
+        token_out_decimals,
+        token_out_symbol,
+        chain,
+        expected_amount,
+        amount_is_output,
+        from_address,
+    )
+    quote_cache.set(cache_key, quote)
+
+    return copy_quote(quote)
+
+async def fetch_quote(
+    token_in_address: ETHAddress,
+    token_in_decimals: int,
+    token_in_symbol: str,
+    token_out_address: ETHAddress,
+    token_out_decimals: int,
+    token_out_symbol: str,
+    chain: ChainId,
+    expected_amount: Decimal,
+    amount_is_output: bool,
+    from_address: ETHAddress,
 ) -> QuoteInformation:
     quote: dict[str, Any] | None = None
     try:
@@ -111,6 +171,49 @@ async def get_quote(
         quote["toolDetails"]["name"],
     )
 
+def get_swap_tokens_metadata(
+    web3: Web3,
+    token_in_address: ETHAddress,
+    token_out_address: ETHAddress,
+    chain: ChainId,
+) -> tuple[str, int, str, int]:
+    native_token_symbol = get_native_token_symbol(chain)
+    erc20_addresses = [address for address in (token_in_address, token_out_address) if address.hex != NATIVE_TOKEN_ADDRESS]
+    metadata = token_metadata.get_many(web3, erc20_addresses, chain.value)
+
+    def symbol_and_decimals(address: ETHAddress) -> tuple[str, int]:
+        if address.hex == NATIVE_TOKEN_ADDRESS:
+            return (native_token_symbol, 18)
+        token = metadata[address.hex.lower()]
+        return (token.symbol, token.decimals)
+
+    return (*symbol_and_decimals(token_in_address), *symbol_and_decimals(token_out_address))
+
+def build_approve_if_needed(
+    web3: Web3,
+    token_address: ETHAddress,
+    _from: ETHAddress,
+    approval_address: str,
+    amount: int,
+) -> TxParams | None:
+    token = web3.eth.contract(
+        address=token_address.hex, abi=ERC20_ABI
+    )
+    allowance = token.functions.allowance(_from.hex, approval_address).call()
+    if allowance >= amount:
+        return None
+
+    return token.functions.approve(
+        approval_address, amount
+    ).build_transaction(
+        {
+            "from": _from.hex,
+            "gasPrice": Wei(
+                int(web3.eth.gas_price * GAS_PRICE_MULTIPLIER)
+            ),
+        }
+    )
+
 def build_swap_transaction(
     web3: Web3,
     amount: Decimal,
@@ -120,7 +223,7 @@ def build_swap_transaction(
     is_exact_input: bool,
     chain: ChainId,
 ) -> list[Transaction]:
-    return asyncio.run(a_build_swap_transaction(web3, amount, token_in_address, token_out_address, _from, is_exact_input, chain))
+    return Lifi.run(a_build_swap_transaction(web3, amount, token_in_address, token_out_address, _from, is_exact_input, chain))
 
 async def a_build_swap_transaction(
     web3: Web3,
@@ -131,32 +234,10 @@ async def a_build_swap_transaction(
     is_exact_input: bool,
     chain: ChainId,
 ) -> list[Transaction]:
-    native_token_symbol = get_native_token_symbol(chain)
     token_in_is_native = token_in_address.hex == NATIVE_TOKEN_ADDRESS
-    token_in = web3.eth.contract(
-        address=token_in_address.hex, abi=ERC20_ABI
-    )
-    token_in_symbol = (
-        native_token_symbol
-        if token_in_is_native
-        else token_in.functions.symbol().call()
-    )
-    token_in_decimals = (
-        18 if token_in_is_native else token_in.functions.decimals().call()
-    )
-
-    token_out_is_native = token_out_address.hex == NATIVE_TOKEN_ADDRESS
-    token_out = web3.eth.contract(
-        address=token_out_address.hex, abi=ERC20_ABI
-    )
-    token_out_decimals = (
-        18 if token_out_is_native else token_out.functions.decimals().call()
-    )
-
-    token_out_symbol = (
-        native_token_symbol
-        if token_out_is_native
-        else token_out.functions.symbol().call()
+    # The RPC calls are made from a thread so that concurrent swaps are not serialized on the event loop
+    (token_in_symbol, token_in_decimals, token_out_symbol, token_out_decimals) = await asyncio.to_thread(
+        get_swap_tokens_metadata, web3, token_in_address, token_out_address, chain
     )
     
     quote = await get_quote(
@@ -174,18 +255,8 @@ async def a_build_swap_transaction(
     transactions: list[Transaction] = []
     if not token_in_is_native:
         approval_address = quote.approval_address
-        allowance = token_in.functions.allowance(_from.hex, approval_address).call()
-        if allowance < quote.amount_in:
-            tx = token_in.functions.approve(
-                approval_address, quote.amount_in
-            ).build_transaction(
-                {
-                    "from": _from.hex,
-                    "gasPrice": Wei(
-                        int(web3.eth.gas_price * GAS_PRICE_MULTIPLIER)
-                    ),
-                }
-            )
+        tx = await asyncio.to_thread(build_approve_if_needed, web3, token_in_address, _from, approval_address, quote.amount_in)
+        if tx:
             transactions.append(
                 ApproveTransaction.create(
                     token=Token(symbol=token_in_symbol, address=str(token_in_address)),
@@ -214,7 +285,7 @@ def can_build_swap_transaction(
     is_exact_input: bool,
     chain: ChainId,
 ) -> bool:
-    return asyncio.run(a_can_build_swap_transaction(web3, amount, token_in_address, token_out_address, _from, is_exact_input, chain))
+    return Lifi.run(a_can_build_swap_transaction(web3, amount, token_in_address, token_out_address, _from, is_exact_input, chain))
 
 async def a_can_build_swap_transaction(
     web3: Web3,
@@ -225,32 +296,10 @@ async def a_can_build_swap_transaction(
     is_exact_input: bool,
     chain: ChainId,
 ) -> bool:
-    native_token_symbol = get_native_token_symbol(chain)
     token_in_is_native = token_in_address.hex == NATIVE_TOKEN_ADDRESS
-    token_in = web3.eth.contract(
-        address=token_in_address.hex, abi=ERC20_ABI
-    )
-    token_in_symbol = (
-        native_token_symbol
-        if token_in_is_native
-        else token_in.functions.symbol().call()
-    )
-    token_in_decimals = (
-        18 if token_in_is_native else token_in.functions.decimals().call()
-    )
-
-    token_out_is_native = token_out_address.hex == NATIVE_TOKEN_ADDRESS
-    token_out = web3.eth.contract(
-        address=token_out_address.hex, abi=ERC20_ABI
-    )
-    token_out_decimals = (
-        18 if token_out_is_native else token_out.functions.decimals().call()
-    )
-
-    token_out_symbol = (
-        native_token_symbol
-        if token_out_is_native
-        else token_out.functions.symbol().call()
+    # The RPC calls are made from a thread so that concurrent swaps are not serialized on the event loop
+    (token_in_symbol, token_in_decimals, token_out_symbol, token_out_decimals) = await asyncio.to_thread(
+        get_swap_tokens_metadata, web3, token_in_address, token_out_address, chain
     )
 
     quote = await get_quote(
@@ -266,17 +315,5 @@ async def a_can_build_swap_transaction(
         _from,
     )
     if not token_in_is_native:
-        approval_address = quote.approval_address
-        allowance = token_in.functions.allowance(_from.hex, approval_address).call()
-        if allowance < quote.amount_in:
-            tx = token_in.functions.approve(
-                approval_address, quote.amount_in
-            ).build_transaction(
-                {
-                    "from": _from.hex,
-                    "gasPrice": Wei(
-                        int(web3.eth.gas_price * GAS_PRICE_MULTIPLIER)
-                    ),
-                }
-            )
+        await asyncio.to_thread(build_approve_if_needed, web3, token_in_address, _from, quote.approval_address, quote.amount_in)
     return True
@@ -1,11 +1,10 @@
 from dataclasses import dataclass
-from typing import cast
 from gnosis.eth import EthereumNetwork
 from web3 import Web3, HTTPProvider
 
 from autotx.utils.constants import ALCHEMY_API_KEY
 from autotx.utils.ethereum.constants import NATIVE_TOKEN_ADDRESS
-from autotx.utils.ethereum.helpers.token_list import token_list
+from autotx.utils.ethereum.token_index import TokenRegistry, get_chain_token_index
 
 ChainId = EthereumNetwork
 
@@ -30,7 +29,7 @@ SUPPORTED_ALCHEMY_NETWORKS: dict[ChainId, str] = {
 class NetworkInfo:
     chain_id: ChainId
     transaction_service_url: str
-    tokens: dict[str, str]
+    tokens: TokenRegistry
 
     def __init__(
         self,
@@ -43,7 +42,7 @@ class NetworkInfo:
             raise Exception(f"Chain ID {chain_id} is not supported")
 
         self.transaction_service_url = config.transaction_service_url
-        self.tokens = { **self.fetch_tokens_for_chain(chain_id), **config.default_tokens }
+        self.tokens = TokenRegistry(get_chain_token_index(chain_id, config.default_tokens))
 
     @staticmethod
     def from_chain_id(chain_id: int) -> 'NetworkInfo':
@@ -55,13 +54,6 @@ class NetworkInfo:
         chain_id = web3.eth.chain_id
         return NetworkInfo(chain_id)
 
-    def fetch_tokens_for_chain(self, chain_id: int) -> dict[str, str]:
-        return {
-            cast(str, token["symbol"]).lower(): Web3.to_checksum_address(cast(str, token["address"]))
-            for token in token_list
-            if token["chainId"] == chain_id and Web3.is_checksum_address(cast(str, token["address"]))
-        }
-
     def get_subsidized_rpc_url(self) -> str | None:
         network = SUPPORTED_ALCHEMY_NETWORKS.get(self.chain_id)
 
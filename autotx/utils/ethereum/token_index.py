@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+import threading
+from types import MappingProxyType
+from typing import Iterator, Mapping, MutableMapping
+
+from web3 import Web3
+
+from autotx.utils.ethereum.helpers.token_list import load_token_list
+
+@dataclass(frozen=True)
+class ChainTokenIndex:
+    # Lowercase symbol -> checksum address
+    by_symbol: Mapping[str, str]
+    # Lowercase address -> lowercase symbol
+    by_address: Mapping[str, str]
+
+_indexes: dict[int, ChainTokenIndex] = {}
+_indexes_lock = threading.Lock()
+
+def build_chain_token_index(chain_id: int, default_tokens: Mapping[str, str]) -> ChainTokenIndex:
+    by_symbol: dict[str, str] = {}
+
+    for token in load_token_list(chain_id):
+        if Web3.is_checksum_address(token.address):
+            by_symbol[token.symbol.lower()] = token.address
+
+    by_symbol.update(default_tokens)
+
+    return ChainTokenIndex(
+        by_symbol=MappingProxyType(by_symbol),
+        by_address=MappingProxyType({ address.lower(): symbol for symbol, address in by_symbol.items() }),
+    )
+
+def get_chain_token_index(chain_id: int, default_tokens: Mapping[str, str]) -> ChainTokenIndex:
+    # Built once per chain and shared by every NetworkInfo of that chain
+    index = _indexes.get(chain_id)
+    if index:
+        return index
+
+    with _indexes_lock:
+        index = _indexes.get(chain_id)
+        if not index:
+            index = build_chain_token_index(chain_id, default_tokens)
+            _indexes[chain_id] = index
+
+    return index
+
+# Token registry of a single run: reads go to the shared chain index,
+# while tokens added during the run are kept in an overlay that only this registry sees
+class TokenRegistry(MutableMapping[str, str]):
+    index: ChainTokenIndex
+
+    def __init__(self, index: ChainTokenIndex):
+        self.index = index
+        self._added: dict[str, str] = {}
+        self._removed: set[str] = set()
+
+    def __getitem__(self, symbol: str) -> str:
+        if symbol in self._added:
+            return self._added[symbol]
+        if symbol in self._removed:
+            raise KeyError(symbol)
+        return self.index.by_symbol[symbol]
+
+    def __setitem__(self, symbol: str, address: str) -> None:
+        self._added[symbol] = address
+        self._removed.discard(symbol)
+
+    def __delitem__(self, symbol: str) -> None:
+        if symbol not in self:
+            raise KeyError(symbol)
+        self._added.pop(symbol, None)
+        if symbol in self.index.by_symbol:
+            self._removed.add(symbol)
+
+    def __contains__(self, symbol: object) -> bool:
+        if symbol in self._added:
+            return True
+        return symbol not in self._removed and symbol in self.index.by_symbol
+
+    def __iter__(self) -> Iterator[str]:
+        for symbol in self.index.by_symbol:
+            if symbol not in self._added and symbol not in self._removed:
+                yield symbol
+        yield from self._added
+
+    def __len__(self) -> int:
+        shared = sum(1 for symbol in self.index.by_symbol if symbol not in self._added and symbol not in self._removed)
+        return shared + len(self._added)
+
+    def get_symbol(self, address: str) -> str | None:
+        address = address.lower()
+        for symbol, added_address in self._added.items():
+            if added_address.lower() == address:
+                return symbol
+        found = self.index.by_address.get(address)
+        if found is None or found in self._removed or found in self._added:
+            return None
+        return found
@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+import json
+import os
+import threading
+from typing import Any, Sequence
+from weakref import WeakKeyDictionary
+
+from gnosis.eth.exceptions import BatchCallException
+from requests.exceptions import RequestException
+from web3 import Web3
+from web3.exceptions import Web3Exception
+
+from autotx.eth_address import ETHAddress
+from autotx.utils.ethereum.cache import cache
+from autotx.utils.ethereum.erc20_abi import ERC20_ABI
+from autotx.utils.ethereum.ethereum_client import get_ethereum_client
+
+@dataclass(frozen=True)
+class TokenMetadata:
+    name: str
+    symbol: str
+    decimals: int
+
+# ERC-20 name, symbol and decimals never change for a deployed contract, so they are fetched once per
+# (chain_id, address), in bulk through Multicall, and kept in memory and in the cache folder
+class TokenMetadataCache:
+    folder: str
+    hits: int
+    misses: int
+
+    def __init__(self, folder: str = cache.folder):
+        self.folder = folder
+        self.hits = 0
+        self.misses = 0
+        self._tokens: dict[int, dict[str, TokenMetadata]] = {}
+        self._chain_ids: WeakKeyDictionary[Web3, int] = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, web3: Web3, address: ETHAddress, chain_id: int | None = None) -> TokenMetadata:
+        return self.get_many(web3, [address], chain_id)[address.hex.lower()]
+
+    def get_many(self, web3: Web3, addresses: Sequence[ETHAddress], chain_id: int | None = None) -> dict[str, TokenMetadata]:
+        # Returns the metadata keyed by lowercase address
+        chain_id = chain_id if chain_id is not None else self._get_chain_id(web3)
+
+        with self._lock:
+            tokens = self._load_chain(chain_id)
+            found = { address.hex.lower(): tokens[address.hex.lower()] for address in addresses if address.hex.lower() in tokens }
+            missing = list({ address.hex.lower(): address for address in addresses if address.hex.lower() not in tokens }.values())
+            self.hits += len(addresses) - len(missing)
+            self.misses += len(missing)
+
+        if not missing:
+            return found
+
+        fetched = self._fetch(web3, missing)
+
+        with self._lock:
+            tokens = self._load_chain(chain_id)
+            tokens.update(fetched)
+            self._save_chain(chain_id, tokens)
+
+        return { **found, **fetched }
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": sum(len(tokens) for tokens in self._tokens.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _get_chain_id(self, web3: Web3) -> int:
+        chain_id = self._chain_ids.get(web3)
+        if chain_id is None:
+            chain_id = web3.eth.chain_id
+            self._chain_ids[web3] = chain_id
+        return chain_id
+
+    def _fetch(self, web3: Web3, addresses: list[ETHAddress]) -> dict[str, TokenMetadata]:
+        contracts = [web3.eth.contract(address=address.hex, abi=ERC20_ABI) for address in addresses]
+        functions = [
+            function
+            for contract in contracts
+            for function in (contract.functions.name(), contract.functions.symbol(), contract.functions.decimals())
+        ]
+
+        results: list[Any] = [None] * len(functions)
+        try:
+            client = get_ethereum_client(web3)
+            if client:
+                # Uses Multicall when the chain has it, a JSON-RPC batch otherwise
+                results = client.batch_call(functions, raise_exception=False)
+        except (BatchCallException, Web3Exception, ValueError, RequestException) as e:
+            # The tokens are then read one call at a time below
+            print(f"Failed to batch the token metadata calls of {len(addresses)} tokens: {e}")
+
+        fetched: dict[str, TokenMetadata] = {}
+        for i, address in enumerate(addresses):
+            (name, symbol, decimals) = results[i * 3:i * 3 + 3]
+
+            # Tokens that do not follow the ERC-20 ABI are read one call at a time, so the error surfaces as before
+            if name is None or symbol is None or decimals is None:
+                contract = contracts[i]
+                name = contract.functions.name().call()
+                symbol = contract.functions.symbol().call()
+                decimals = contract.functions.decimals().call()
+
+            fetched[address.hex.lower()] = TokenMetadata(name=name, symbol=symbol, decimals=decimals)
+
+        return fetched
+
+    def _path(self, chain_id: int) -> str:
+        return os.path.join(self.folder, f"token-metadata-{chain_id}.json")
+
+    def _load_chain(self, chain_id: int) -> dict[str, TokenMetadata]:
+        tokens = self._tokens.get(chain_id)
+        if tokens is not None:
+            return tokens
+
+        tokens = {}
+        try:
+            with open(self._path(chain_id), "r") as f:
+                for address, (name, symbol, decimals) in json.load(f).items():
+                    tokens[address] = TokenMetadata(name=name, symbol=symbol, decimals=decimals)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ignoring unreadable token metadata cache for chain {chain_id}: {e}")
+
+        self._tokens[chain_id] = tokens
+        return tokens
+
+    def _save_chain(self, chain_id: int, tokens: dict[str, TokenMetadata]) -> None:
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            path = self._path(chain_id)
+            with open(f"{path}.tmp", "w") as f:
+                json.dump({ address: [token.name, token.symbol, token.decimals] for address, token in tokens.items() }, f)
+            os.replace(f"{path}.tmp", path)
+        except Exception as e:
+            print(f"Failed to write token metadata cache for chain {chain_id}: {e}")
+
+token_metadata = TokenMetadataCache()
@@ -0,0 +1,238 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import Enum, IntEnum
+import random
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_in_sec: float):
+        super().__init__(f"{name} is unavailable, retrying in {retry_in_sec:.0f}s")
+        self.name = name
+        self.retry_in_sec = retry_in_sec
+
+
+class RateLimitExceededError(Exception):
+    def __init__(self, retry_in_sec: float):
+        super().__init__(f"Client-side rate limit reached, the next request could be made in {retry_in_sec:.0f}s")
+        self.retry_in_sec = retry_in_sec
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    # Retry-After is either a number of seconds or an HTTP date
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 5
+    base_delay_sec: float = 0.5
+    max_delay_sec: float = 8
+    # A Retry-After longer than this is not waited for, the error is raised instead
+    max_retry_after_sec: float = 60
+
+    def get_delay(self, attempt: int, retry_after_sec: float | None = None) -> float | None:
+        # Returns how long to wait before the next attempt (attempt starts at 1), or None to give up
+        if attempt >= self.max_attempts:
+            return None
+        if retry_after_sec is not None:
+            if retry_after_sec > self.max_retry_after_sec:
+                return None
+            # A little jitter on top so that the callers told to come back at the same time do not all do so
+            return retry_after_sec + random.uniform(0, self.base_delay_sec)
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.max_delay_sec, self.base_delay_sec * 2 ** (attempt - 1)))
+
+
+class Priority(IntEnum):
+    # Lower values are served first
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+# Client-side limiter: tokens are refilled at rate_per_sec up to capacity and every request takes one.
+# Async callers that find the bucket empty reserve the next token and wait for it with asyncio (acquire),
+# sync callers wait in line on a condition (wait), where callers of a higher priority go first.
+# One bucket can be shared by the threads and event loops of the process.
+class TokenBucket:
+    rate_per_sec: float
+    capacity: float
+
+    def __init__(self, rate_per_sec: float, capacity: float):
+        self.rate_per_sec = rate_per_sec
+        self.capacity = capacity
+        self.throttled = 0
+        self.rejected = 0
+        self.throttle_wait_sec = 0.0
+        self.throttle_wait_sec_by_priority = { priority: 0.0 for priority in Priority }
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._waiting = { priority: 0 for priority in Priority }
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_sec)
+        self._updated_at = now
+
+    def reserve(self, max_wait_sec: float | None = None) -> float:
+        # Takes a token and returns how long to wait before it can be used.
+        # If that is longer than max_wait_sec, the token is given back and RateLimitExceededError is raised instead
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0.0
+
+            wait_sec = -self._tokens / self.rate_per_sec
+            if max_wait_sec is not None and wait_sec > max_wait_sec:
+                self._tokens += 1
+                self.rejected += 1
+                raise RateLimitExceededError(wait_sec)
+
+            self.throttled += 1
+            self.throttle_wait_sec += wait_sec
+            return wait_sec
+
+    async def acquire(self, max_wait_sec: float | None = None) -> float:
+        wait_sec = self.reserve(max_wait_sec)
+        if wait_sec > 0:
+            await asyncio.sleep(wait_sec)
+        return wait_sec
+
+    def wait(self, priority: Priority = Priority.INTERACTIVE) -> float:
+        # Blocks until a token is taken and returns how long it waited
+        started_at = time.monotonic()
+
+        with self._condition:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    self._refill()
+                    higher_priority_waiting = any(count for other, count in self._waiting.items() if other < priority)
+                    if self._tokens >= 1 and not higher_priority_waiting:
+                        self._tokens -= 1
+                        break
+                    # Woken up early when another caller takes a token, so that the next in line re-checks
+                    self._condition.wait(timeout=max(0.01, (1 - self._tokens) / self.rate_per_sec))
+            finally:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+
+            wait_sec = time.monotonic() - started_at
+            if wait_sec > 0.001:
+                self.throttled += 1
+                self.throttle_wait_sec += wait_sec
+                self.throttle_wait_sec_by_priority[priority] += wait_sec
+
+            return wait_sec
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "throttled": self.throttled,
+                "rejected": self.rejected,
+                "throttle_wait_sec": round(self.throttle_wait_sec, 3),
+                **{
+                    f"{priority.name.lower()}_throttle_wait_sec": round(wait_sec, 3)
+                    for priority, wait_sec in self.throttle_wait_sec_by_priority.items()
+                },
+                "waiting": sum(self._waiting.values()),
+            }
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Opens after failure_threshold consecutive failures so that callers fail fast while the upstream is down.
+# After reset_timeout_sec a single trial call is let through (half open): it closes the circuit on success
+# and opens it again on failure.
+class CircuitBreaker:
+    name: str
+    failure_threshold: int
+    reset_timeout_sec: float
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout_sec: float = 30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_sec = reset_timeout_sec
+        self.opened = 0
+        self.rejected = 0
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._state
+
+    def before_call(self) -> None:
+        # Raises CircuitOpenError instead of letting the call through while the circuit is open
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return
+
+            retry_in_sec = self._opened_at + self.reset_timeout_sec - time.monotonic()
+            if self._state == CircuitState.OPEN and retry_in_sec <= 0:
+                self._state = CircuitState.HALF_OPEN
+                self._trial_in_progress = False
+
+            if self._state == CircuitState.HALF_OPEN and not self._trial_in_progress:
+                self._trial_in_progress = True
+                return
+
+            self.rejected += 1
+            raise CircuitOpenError(self.name, max(0.0, retry_in_sec))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._trial_in_progress = False
+
+    def release(self) -> None:
+        # For a call that ended without an outcome (e.g. cancelled), so that another trial call can go through
+        with self._lock:
+            self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != CircuitState.OPEN:
+                    self.opened += 1
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_progress = False
+
+    def stats(self) -> dict[str, int | str]:
+        with self._lock:
+            return {
+                "state": self._state.value,
+                "consecutive_failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+import threading
+import time
+from typing import Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+# Thread-safe in-memory cache where entries expire after ttl_sec
+# and the least recently used entry is evicted once max_size is reached
+class TTLCache(Generic[T]):
+    ttl_sec: float
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, ttl_sec: float, max_size: int):
+        self.ttl_sec = ttl_sec
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> T | None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: T) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_sec, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,139 @@
+# Compares Li.Fi quote latency with a new aiohttp session per request (the former behaviour) and with the shared session.
+# Usage: python lifi_benchmark.py [--requests 50] [--concurrency 4] [--base-url https://li.quest/v1]
+# Without --base-url a local stand-in of the quote endpoint is started, with an artificial delay per new connection to
+# account for the TCP and TLS handshakes a remote endpoint would need
+import argparse
+import asyncio
+import statistics
+import time
+import weakref
+from typing import Any, Awaitable, Callable
+
+import aiohttp
+from aiohttp import web
+
+from autotx.eth_address import ETHAddress
+from autotx.utils.ethereum.constants import NATIVE_TOKEN_ADDRESS
+from autotx.utils.ethereum.lifi import Lifi, add_authorization_info_if_provided, handle_lifi_response
+from autotx.utils.ethereum.networks import ChainId
+
+USDC_ADDRESS = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+VITALIK_ADDRESS = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
+
+QUOTE_RESPONSE: dict[str, Any] = {
+    "estimate": { "approvalAddress": VITALIK_ADDRESS, "fromAmount": "1000000000000000000", "toAmountMin": "3000000000" },
+    "transactionRequest": {
+        "to": VITALIK_ADDRESS,
+        "from": VITALIK_ADDRESS,
+        "data": "0x",
+        "gasPrice": "0x1",
+        "gasLimit": "0x1",
+        "value": "0x0",
+        "chainId": 1,
+    },
+    "toolDetails": { "name": "stand-in" },
+}
+
+async def start_stand_in(connection_delay_sec: float, response_delay_sec: float) -> tuple[web.AppRunner, str]:
+    async def on_connection(request: web.Request) -> None:
+        # Each new connection pays the handshake delay once, keep-alive connections do not
+        transport = request.transport
+        if transport and transport not in seen_transports:
+            seen_transports.add(transport)
+            await asyncio.sleep(connection_delay_sec)
+
+    async def quote(request: web.Request) -> web.Response:
+        await on_connection(request)
+        await asyncio.sleep(response_delay_sec)
+        return web.json_response(QUOTE_RESPONSE)
+
+    seen_transports: weakref.WeakSet[asyncio.BaseTransport] = weakref.WeakSet()
+    app = web.Application()
+    app.router.add_get("/quote", quote)
+    app.router.add_post("/quote/contractCalls", quote)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    return (runner, f"http://127.0.0.1:{port}")
+
+def quote_params() -> dict[str, Any]:
+    return {
+        "fromToken": NATIVE_TOKEN_ADDRESS,
+        "toToken": USDC_ADDRESS,
+        "fromAmount": 10**18,
+        "fromAddress": VITALIK_ADDRESS,
+        "fromChain": ChainId.MAINNET.value,
+        "toChain": ChainId.MAINNET.value,
+        "slippage": 0.005,
+    }
+
+async def quote_with_new_session() -> dict[str, Any]:
+    params = quote_params()
+    headers = add_authorization_info_if_provided(params)
+    async with aiohttp.ClientSession() as session:
+        async with session.get(Lifi.BASE_URL + "/quote", params=params, headers=headers, timeout=10) as response:
+            return await handle_lifi_response(response)
+
+async def quote_with_shared_session() -> dict[str, Any]:
+    return await Lifi.get_quote_from_amount(
+        ETHAddress(NATIVE_TOKEN_ADDRESS),
+        ETHAddress(USDC_ADDRESS),
+        10**18,
+        ETHAddress(VITALIK_ADDRESS),
+        ChainId.MAINNET,
+        0.005,
+    )
+
+async def measure(fetch_quote: Callable[[], Awaitable[dict[str, Any]]], requests: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    timings: list[float] = []
+
+    async def timed() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await fetch_quote()
+            timings.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[timed() for _ in range(requests)])
+    return timings
+
+async def a_run(args: argparse.Namespace) -> None:
+    runner: web.AppRunner | None = None
+    if args.base_url:
+        Lifi.BASE_URL = args.base_url
+    else:
+        (runner, Lifi.BASE_URL) = await start_stand_in(args.connection_delay_ms / 1000, args.response_delay_ms / 1000)
+
+    try:
+        results = {
+            "new session per quote": await measure(quote_with_new_session, args.requests, args.concurrency),
+            "shared session": await measure(quote_with_shared_session, args.requests, args.concurrency),
+        }
+    finally:
+        await Lifi.close()
+        if runner:
+            await runner.cleanup()
+
+    print(f"{args.requests} quotes from {Lifi.BASE_URL}, {args.concurrency} at a time:")
+    for name, timings in results.items():
+        timings_ms = sorted(timing * 1000 for timing in timings)
+        p95 = timings_ms[int(len(timings_ms) * 0.95) - 1]
+        print(f"  {name:<22} median {statistics.median(timings_ms):7.1f} ms  p95 {p95:7.1f} ms")
+
+def run() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--base-url", help="Benchmark against a real Li.Fi endpoint instead of the local stand-in")
+    parser.add_argument("--connection-delay-ms", type=float, default=60, help="Stand-in cost of a new connection (TCP and TLS handshakes)")
+    parser.add_argument("--response-delay-ms", type=float, default=20, help="Stand-in time to compute a quote")
+    args = parser.parse_args()
+
+    asyncio.run(a_run(args))
+
+if __name__ == "__main__":
+    run()
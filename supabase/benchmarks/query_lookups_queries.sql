@@ -0,0 +1,21 @@
+-- The lookups made by autotx/db.py, run by query_lookups.sql
+
+\echo '-- get_app_user'
+explain (analyze, costs off, timing off, summary on)
+select * from public.app_users where app_id = :'app_id' and user_id = :'user_id';
+
+\echo '-- TasksRepository.get_all (first page)'
+explain (analyze, costs off, timing off, summary on)
+select id, prompt, created_at from public.tasks where app_id = :'app_id' order by created_at, id limit 51;
+
+\echo '-- TasksRepository.get_from_user (first page)'
+explain (analyze, costs off, timing off, summary on)
+select id, prompt, created_at from public.tasks where app_id = :'app_id' and app_user_id = :'app_user_id' order by created_at, id limit 51;
+
+\echo '-- get_submitted_batches'
+explain (analyze, costs off, timing off, summary on)
+select * from public.submitted_batches where app_id = :'app_id' and task_id = :'task_id';
+
+\echo '-- get_submitted_transactions_from_user'
+explain (analyze, costs off, timing off, summary on)
+select transactions from public.submitted_batches where app_id = :'app_id' and app_user_id = :'app_user_id' and submitted_on is not null;
@@ -0,0 +1,141 @@
+create table "public"."task_messages" (
+    "id" bigint generated by default as identity not null,
+    "created_at" timestamp with time zone not null default now(),
+    "task_id" uuid not null,
+    "message" text not null
+);
+
+
+alter table "public"."task_messages" enable row level security;
+
+create table "public"."task_logs" (
+    "id" bigint generated by default as identity not null,
+    "created_at" timestamp with time zone not null default now(),
+    "task_id" uuid not null,
+    "type" text not null,
+    "obj" text not null
+);
+
+
+alter table "public"."task_logs" enable row level security;
+
+CREATE UNIQUE INDEX task_messages_pkey ON public.task_messages USING btree (id);
+
+CREATE UNIQUE INDEX task_logs_pkey ON public.task_logs USING btree (id);
+
+CREATE INDEX task_messages_task_id_id_idx ON public.task_messages USING btree (task_id, id);
+
+CREATE INDEX task_logs_task_id_id_idx ON public.task_logs USING btree (task_id, id);
+
+alter table "public"."task_messages" add constraint "task_messages_pkey" PRIMARY KEY using index "task_messages_pkey";
+
+alter table "public"."task_logs" add constraint "task_logs_pkey" PRIMARY KEY using index "task_logs_pkey";
+
+alter table "public"."task_messages" add constraint "public_task_messages_task_id_fkey" FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE not valid;
+
+alter table "public"."task_messages" validate constraint "public_task_messages_task_id_fkey";
+
+alter table "public"."task_logs" add constraint "public_task_logs_task_id_fkey" FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE not valid;
+
+alter table "public"."task_logs" validate constraint "public_task_logs_task_id_fkey";
+
+-- Move the existing messages and logs out of the task rows, keeping their order.
+-- The API wrote them as JSON strings holding the arrays (json.dumps through PostgREST), so they are unwrapped first.
+insert into "public"."task_messages" ("task_id", "created_at", "message")
+select t.id, t.created_at, m.value #>> '{}'
+from "public"."tasks" t, json_array_elements((t.messages #>> '{}')::json) with ordinality as m(value, position)
+order by t.created_at, t.id, m.position;
+
+insert into "public"."task_logs" ("task_id", "created_at", "type", "obj")
+select t.id, (l.value ->> 'created_at')::timestamp with time zone, l.value ->> 'type', l.value ->> 'obj'
+from "public"."tasks" t, json_array_elements((t.logs #>> '{}')::json) with ordinality as l(value, position)
+where t.logs is not null
+order by t.created_at, t.id, l.position;
+
+alter table "public"."tasks" drop column "messages";
+
+alter table "public"."tasks" drop column "logs";
+
+grant delete on table "public"."task_messages" to "anon";
+
+grant insert on table "public"."task_messages" to "anon";
+
+grant references on table "public"."task_messages" to "anon";
+
+grant select on table "public"."task_messages" to "anon";
+
+grant trigger on table "public"."task_messages" to "anon";
+
+grant truncate on table "public"."task_messages" to "anon";
+
+grant update on table "public"."task_messages" to "anon";
+
+grant delete on table "public"."task_messages" to "authenticated";
+
+grant insert on table "public"."task_messages" to "authenticated";
+
+grant references on table "public"."task_messages" to "authenticated";
+
+grant select on table "public"."task_messages" to "authenticated";
+
+grant trigger on table "public"."task_messages" to "authenticated";
+
+grant truncate on table "public"."task_messages" to "authenticated";
+
+grant update on table "public"."task_messages" to "authenticated";
+
+grant delete on table "public"."task_messages" to "service_role";
+
+grant insert on table "public"."task_messages" to "service_role";
+
+grant references on table "public"."task_messages" to "service_role";
+
+grant select on table "public"."task_messages" to "service_role";
+
+grant trigger on table "public"."task_messages" to "service_role";
+
+grant truncate on table "public"."task_messages" to "service_role";
+
+grant update on table "public"."task_messages" to "service_role";
+
+grant delete on table "public"."task_logs" to "anon";
+
+grant insert on table "public"."task_logs" to "anon";
+
+grant references on table "public"."task_logs" to "anon";
+
+grant select on table "public"."task_logs" to "anon";
+
+grant trigger on table "public"."task_logs" to "anon";
+
+grant truncate on table "public"."task_logs" to "anon";
+
+grant update on table "public"."task_logs" to "anon";
+
+grant delete on table "public"."task_logs" to "authenticated";
+
+grant insert on table "public"."task_logs" to "authenticated";
+
+grant references on table "public"."task_logs" to "authenticated";
+
+grant select on table "public"."task_logs" to "authenticated";
+
+grant trigger on table "public"."task_logs" to "authenticated";
+
+grant truncate on table "public"."task_logs" to "authenticated";
+
+grant update on table "public"."task_logs" to "authenticated";
+
+grant delete on table "public"."task_logs" to "service_role";
+
+grant insert on table "public"."task_logs" to "service_role";
+
+grant references on table "public"."task_logs" to "service_role";
+
+grant select on table "public"."task_logs" to "service_role";
+
+grant trigger on table "public"."task_logs" to "service_role";
+
+grant truncate on table "public"."task_logs" to "service_role";
+
+grant update on table "public"."task_logs" to "service_role";
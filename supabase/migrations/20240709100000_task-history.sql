@@ -0,0 +1,34 @@
+-- Returns a task followed by all of its previous tasks (following previous_task_id),
+-- with only the columns needed to build a feedback prompt
+create or replace function "public"."get_task_history"("history_task_id" uuid, "history_app_id" uuid)
+returns table (
+    "id" uuid,
+    "prompt" text,
+    "intents" json,
+    "feedback" text,
+    "previous_task_id" uuid,
+    "depth" integer
+)
+language sql
+stable
+as $$
+    with recursive history as (
+        select t.id, t.prompt, t.intents, t.feedback, t.previous_task_id, 0 as depth
+        from public.tasks t
+        where t.id = history_task_id and t.app_id = history_app_id
+        union all
+        select t.id, t.prompt, t.intents, t.feedback, t.previous_task_id, h.depth + 1
+        from public.tasks t
+        join history h on t.id = h.previous_task_id
+        where t.app_id = history_app_id and h.depth < 1000
+    )
+    select history.id, history.prompt, history.intents, history.feedback, history.previous_task_id, history.depth
+    from history
+    order by history.depth;
+$$;
+
+grant execute on function "public"."get_task_history"(uuid, uuid) to "anon";
+
+grant execute on function "public"."get_task_history"(uuid, uuid) to "authenticated";
+
+grant execute on function "public"."get_task_history"(uuid, uuid) to "service_role";
@@ -0,0 +1,49 @@
+CREATE INDEX tasks_app_id_created_at_id_idx ON public.tasks USING btree (app_id, created_at, id);
+
+CREATE INDEX tasks_app_id_app_user_id_created_at_id_idx ON public.tasks USING btree (app_id, app_user_id, created_at, id);
+
+CREATE INDEX app_users_app_id_user_id_idx ON public.app_users USING btree (app_id, user_id);
+
+CREATE INDEX submitted_batches_app_id_task_id_idx ON public.submitted_batches USING btree (app_id, task_id);
+
+CREATE INDEX submitted_batches_app_id_app_user_id_submitted_idx ON public.submitted_batches USING btree (app_id, app_user_id) WHERE (submitted_on IS NOT NULL);
+
+-- The blobs were written as JSON strings holding the serialized value, unwrap them into real jsonb
+alter table "public"."tasks" alter column "intents" type jsonb using (intents #>> '{}')::jsonb;
+
+alter table "public"."submitted_batches" alter column "transactions" type jsonb using (transactions #>> '{}')::jsonb;
+
+drop function if exists "public"."get_task_history"(uuid, uuid);
+
+create or replace function "public"."get_task_history"("history_task_id" uuid, "history_app_id" uuid)
+returns table (
+    "id" uuid,
+    "prompt" text,
+    "intents" jsonb,
+    "feedback" text,
+    "previous_task_id" uuid,
+    "depth" integer
+)
+language sql
+stable
+as $$
+    with recursive history as (
+        select t.id, t.prompt, t.intents, t.feedback, t.previous_task_id, 0 as depth
+        from public.tasks t
+        where t.id = history_task_id and t.app_id = history_app_id
+        union all
+        select t.id, t.prompt, t.intents, t.feedback, t.previous_task_id, h.depth + 1
+        from public.tasks t
+        join history h on t.id = h.previous_task_id
+        where t.app_id = history_app_id and h.depth < 1000
+    )
+    select history.id, history.prompt, history.intents, history.feedback, history.previous_task_id, history.depth
+    from history
+    order by history.depth;
+$$;
+
+grant execute on function "public"."get_task_history"(uuid, uuid) to "anon";
+
+grant execute on function "public"."get_task_history"(uuid, uuid) to "authenticated";
+
+grant execute on function "public"."get_task_history"(uuid, uuid) to "service_role";
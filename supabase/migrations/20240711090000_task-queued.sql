@@ -0,0 +1,2 @@
+-- Tasks waiting for a free slot are queued rather than running
+alter table "public"."tasks" add column "queued" boolean not null default false;
@@ -0,0 +1,90 @@
+# Compares the startup cost of the per-chain JSON token lists with the former token_list.py module literal.
+# Usage: python token_list_benchmark.py [--legacy path/to/old/token_list.py] [--chain-id 1]
+# Both variants are loaded by file path, so the cost of importing the autotx package is left out
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+HELPERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "autotx", "utils", "ethereum", "helpers")
+TOKEN_LISTS_DIR = os.path.join(HELPERS_DIR, "token_lists")
+
+MEASURE = """
+import resource, sys, time
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+{load}
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline)
+"""
+
+LOAD_MODULE = """
+import importlib.util
+spec = importlib.util.spec_from_file_location("token_list", {path!r})
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+"""
+
+LOAD_LEGACY = LOAD_MODULE + """
+tokens = [token for token in module.token_list if token["chainId"] == {chain_id}]
+"""
+
+LOAD_PER_CHAIN = LOAD_MODULE + """
+tokens = module.load_token_list({chain_id})
+"""
+
+def write_legacy_module(directory: str) -> str:
+    # Rebuilds the former module literal from the JSON lists (without the logo URIs, which are no longer kept)
+    tokens: list[dict[str, object]] = []
+    for file_name in sorted(os.listdir(TOKEN_LISTS_DIR)):
+        chain_id = int(file_name.removesuffix(".json"))
+        with open(os.path.join(TOKEN_LISTS_DIR, file_name), "r", encoding="utf-8") as f:
+            for symbol, address, name, decimals in json.load(f):
+                tokens.append({ "chainId": chain_id, "address": address, "symbol": symbol, "name": name, "decimals": decimals })
+
+    path = os.path.join(directory, "token_list.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"token_list = {json.dumps(tokens, indent=2)}\n")
+
+    return path
+
+def measure(load: str, runs: int) -> tuple[float, int]:
+    timings: list[float] = []
+    memory: list[int] = []
+
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-B", "-c", MEASURE.format(load=load)],
+            capture_output=True, text=True, check=True,
+        )
+        elapsed, max_rss_kb = result.stdout.split()
+        timings.append(float(elapsed))
+        memory.append(int(max_rss_kb))
+
+    return (sorted(timings)[len(timings) // 2], sorted(memory)[len(memory) // 2])
+
+def run() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--legacy", help="Path to the former token_list.py module")
+    parser.add_argument("--chain-id", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_path = args.legacy if args.legacy else write_legacy_module(directory)
+
+        results = {
+            "token_list.py module": measure(LOAD_LEGACY.format(path=legacy_path, chain_id=args.chain_id), args.runs),
+            f"token_lists/{args.chain_id}.json": measure(
+                LOAD_PER_CHAIN.format(path=os.path.join(HELPERS_DIR, "token_list.py"), chain_id=args.chain_id), args.runs
+            ),
+        }
+
+    print(f"Median of {args.runs} cold runs, loading the tokens of chain {args.chain_id}:")
+    for name, (elapsed, max_rss_kb) in results.items():
+        print(f"  {name:<28} {elapsed * 1000:8.1f} ms  +{max_rss_kb / 1024:6.1f} MiB max RSS")
+
+if __name__ == "__main__":
+    run()